@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for robots.txt user-agent matching in the crawler
+"""
+
+import asyncio
+
+from aiohttp import web
+
+from unified_server import CrawlRequest, recursive_crawl
+
+ROBOTS_TXT = """User-agent: CrawlOps-Studio
+Disallow: /private
+
+User-agent: Mozilla
+Disallow: /
+"""
+
+PAGE_HTML = """<html><head><title>{title}</title></head>
+<body><p>Robots test page {title}</p>
+<a href="/docs/page">Docs</a> <a href="/private/page">Private</a></body></html>
+"""
+
+async def crawl_with_bot_specific_block():
+    """Crawl a local site whose robots.txt has a CrawlOps-Studio group and a Mozilla group"""
+    app = web.Application()
+    app.router.add_get("/robots.txt", lambda request: web.Response(text=ROBOTS_TXT))
+    app.router.add_get("/{path:.*}", lambda request: web.Response(
+        text=PAGE_HTML.format(title=request.path), content_type="text/html"))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base = f"http://127.0.0.1:{port}"
+
+    try:
+        crawl_request = CrawlRequest(url=f"{base}/", max_depth=1, max_pages=10, export_formats=[],
+                                     delay_seconds=0.1, max_urls_per_host_per_minute=600)
+        results = await recursive_crawl(crawl_request)
+    finally:
+        await runner.cleanup()
+
+    crawled = {result["url"].replace(base, "") for result in results}
+    print(f"Crawled paths: {sorted(crawled)}")
+    # The CrawlOps-Studio group applies; the Mozilla group must not
+    return "/docs/page" in crawled and "/private/page" not in crawled
+
+def test_robots_bot_specific_block():
+    """Test that the crawler honours its own robots.txt group and ignores the Mozilla one"""
+    assert asyncio.run(crawl_with_bot_specific_block())
+
+if __name__ == "__main__":
+    print("Testing robots.txt user-agent matching...")
+    success = asyncio.run(crawl_with_bot_specific_block())
+    print(f"\nrobots.txt user-agent test: {'✅ PASSED' if success else '❌ FAILED'}")
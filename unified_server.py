@@ -4,44 +4,67 @@ Unified server that serves both the React frontend and the FastAPI backend
 This solves the Replit networking issues by having everything on port 5000
 """
 
+import asyncio
+import atexit
+import base64
 import csv
+import gzip
+import hashlib
+import html
+import mimetypes
 import os
 import sys
 import json
 import logging
 import platform
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager, nullcontext
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
-from io import StringIO
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Form
+from datetime import datetime, timedelta, timezone
+from io import BytesIO, StringIO
+from logging.handlers import QueueHandler, QueueListener
+from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Form, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 
-# Fix Windows event loop policy for aiodns compatibility and Playwright issues
-if platform.system() == 'Windows':
-    try:
-        import asyncio
-        if sys.version_info >= (3, 8):
-            # Windows ProactorEventLoop doesn't support aiodns and has Playwright subprocess issues
-            # Force SelectorEventLoop on Windows for better compatibility
-            if hasattr(asyncio, 'WindowsSelectorEventLoopPolicy'):
-                asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-                logging.info("Set Windows SelectorEventLoop policy for compatibility")
-            else:
-                # Fallback for older Python versions
-                logging.warning("WindowsSelectorEventLoopPolicy not available, using default policy")
-    except Exception as e:
-        logging.warning(f"Failed to set Windows event loop policy: {e}")
-        
-    # Global Playwright disable flag for Windows if subprocess issues persist  
-    import os
-    os.environ.setdefault('PLAYWRIGHT_DISABLE_SUBPROCESS', '1')
-    os.environ.setdefault('CRAWL4AI_BROWSER_TYPE', 'http_only')
-    os.environ.setdefault('DISABLE_BROWSER_AUTOMATION', '1')
-    logging.info("Set Windows compatibility environment variables for Playwright issues")
+import aiohttp
+
+# Optional fast HTML parser (C/lexbor); BeautifulSoup is used when unavailable
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Optional fast JSON serializer; the stdlib json module is used when unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional SIMD base64 encoder for inlined resources; the stdlib base64 module is used when unavailable
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+# Optional c-ares bindings for non-blocking DNS lookups; aiohttp's threaded getaddrinfo is used when unavailable
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
 
 # Add the API directory to the path
 sys.path.insert(0, str(Path(__file__).parent / "apps" / "api"))
@@ -74,10 +97,8 @@ logging.basicConfig(
     handlers=[
         # Console output
         logging.StreamHandler(),
-        # Main application log
-        logging.FileHandler(log_dir / "crawlops_server.log", encoding='utf-8'),
-        # Detailed scraping log
-        logging.FileHandler(log_dir / "scraping_detailed.log", encoding='utf-8')
+        # Main application log (scraping activity has its own file below)
+        logging.FileHandler(log_dir / "crawlops_server.log", encoding='utf-8')
     ]
 )
 
@@ -102,28 +123,182 @@ api_logger.setLevel(logging.INFO)
 # Prevent duplicate console output for API logger
 api_logger.propagate = False
 
+def queue_log_handlers(target_logger: logging.Logger) -> QueueListener:
+    """Move a logger's handlers behind a queue drained by a background thread.
+    
+    Log calls on the event loop then only enqueue the record; the file and
+    console writes happen on the listener thread.
+    """
+    handlers = target_logger.handlers[:]
+    for handler in handlers:
+        target_logger.removeHandler(handler)
+    log_queue = queue.Queue(-1)
+    target_logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+# One listener per logger so each keeps writing only to its own files
+for target_logger in (logging.getLogger(), scraping_logger, api_logger):
+    queue_log_handlers(target_logger)
+
 # Log initialization message
-print(logger_init_msg)
 logger.info(logger_init_msg)
 logger.info(f"Platform: {platform.system()}")
 logger.info(f"Python version: {sys.version}")
 logger.info("Logging system initialized successfully")
 
+def configure_event_loop():
+    """Choose the event loop policy for this platform.
+    
+    Runs after logging is configured; logging through the root logger before
+    basicConfig would install a default handler and turn basicConfig into a no-op.
+    """
+    if platform.system() == 'Windows':
+        try:
+            # Windows ProactorEventLoop doesn't support aiodns and has Playwright subprocess issues
+            # Force SelectorEventLoop on Windows for better compatibility
+            if hasattr(asyncio, 'WindowsSelectorEventLoopPolicy'):
+                asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+                logger.info("Set Windows SelectorEventLoop policy for compatibility")
+            else:
+                logger.warning("WindowsSelectorEventLoopPolicy not available, using default policy")
+        except Exception as e:
+            logger.warning(f"Failed to set Windows event loop policy: {e}")
+        
+        # Global Playwright disable flag for Windows if subprocess issues persist
+        os.environ.setdefault('PLAYWRIGHT_DISABLE_SUBPROCESS', '1')
+        os.environ.setdefault('CRAWL4AI_BROWSER_TYPE', 'http_only')
+        os.environ.setdefault('DISABLE_BROWSER_AUTOMATION', '1')
+        logger.info("Set Windows compatibility environment variables for Playwright issues")
+    else:
+        # Use uvloop (installed with uvicorn[standard]) as a faster drop-in event loop
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+
+configure_event_loop()
+
+# Output folder for crawl and PDF exports (created once at startup)
+OUTPUT_DIR = Path("./crawl_output")
+OUTPUT_DIR.mkdir(exist_ok=True)
+
+# Worker processes for CPU-bound HTML parsing and PDF text extraction (created on first use)
+_parse_pool = None
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Return the shared parsing process pool, creating it if needed."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _parse_pool
+
+def discard_parse_pool(pool: ProcessPoolExecutor):
+    """Shut down a broken parsing pool; the next get_parse_pool() call starts a fresh one."""
+    global _parse_pool
+    if _parse_pool is pool:
+        _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+async def run_in_parse_pool(func, *args):
+    """Run func(*args) in the parsing process pool.
+    
+    A worker that dies (OOM kill, segfault) breaks the whole pool, so on
+    BrokenExecutor the pool is replaced and the call retried once.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = get_parse_pool()
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenExecutor:
+            discard_parse_pool(pool)
+            if attempt:
+                raise
+
+# Resolved addresses are reused for this long, so repeat hosts skip the resolver entirely
+DNS_CACHE_TTL = 900
+
+def create_tcp_connector(limit: int, limit_per_host: int) -> aiohttp.TCPConnector:
+    """Build a pooling connector with DNS caching, resolving through aiodns when installed."""
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        resolver=aiohttp.AsyncResolver() if aiodns is not None else None,
+        # Idle connections stay open 30s so rate-limited hosts still reuse them between requests
+        keepalive_timeout=30
+    )
+
+_http_session = None
+
+def get_http_session():
+    """Return the aiohttp session shared by request handlers, creating it if needed.
+    
+    Cookies are not stored, so nothing leaks between unrelated requests;
+    per-request headers are passed to each call.
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=create_tcp_connector(limit=100, limit_per_host=10),
+            cookie_jar=aiohttp.DummyCookieJar()
+        )
+    return _http_session
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up and tear down resources shared across requests."""
+    await asyncio.to_thread(init_session_db)
+    session_reaper = asyncio.create_task(reap_expired_sessions())
+    yield
+    session_reaper.cancel()
+    # Close pooled session database connections
+    session_db_pool.close_all()
+    # Stop HTML parsing workers
+    global _parse_pool, _http_session
+    if _parse_pool is not None:
+        _parse_pool.shutdown(cancel_futures=True)
+        _parse_pool = None
+    # Close pooled HTTP connections
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson in a single C pass."""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 # Create FastAPI app
 app = FastAPI(
     title="CrawlOps Studio",
     description="Unified frontend and backend for CrawlOps Studio",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Large crawl payloads serialize much faster with orjson
+    default_response_class=OrjsonResponse if orjson is not None else JSONResponse
 )
 
-# Configure CORS
+# Compress large responses (SingleFile HTML, crawl results); level 5 trades a little ratio for CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Configure CORS; added last so it is the outermost middleware and answers preflights before anything else runs
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["*"]
+    expose_headers=["*"],
+    # Let browsers reuse a preflight result for a day instead of the 10-minute default
+    max_age=86400
 )
 
 # Include session management router
@@ -155,21 +330,48 @@ class CrawlRequest(BaseModel):
     auth_username: str = ""  # For basic auth
     auth_password: str = ""  # For basic auth
     custom_headers: dict = {} # Additional custom headers
+    # Number of pages fetched in parallel (capped at MAX_CRAWL_CONCURRENCY)
+    concurrency: int = 4
 
 class CrawlStatus(BaseModel):
+    crawl_id: Optional[str] = None
     status: str
     pages_crawled: int = 0
     success_rate: float = 0.0
     queue_size: int = 0
     message: Optional[str] = None
 
-# Global crawl state
-crawl_state = {
-    "status": "stopped",
-    "pages_crawled": 0,
-    "success_rate": 0.0,
-    "queue_size": 0
-}
+# Crawl worker limits
+MAX_CRAWL_CONCURRENCY = 32
+MAX_REQUESTS_PER_HOST = 4
+# Requests in flight to one host across all endpoints (crawls, SingleFile, PDF links)
+MAX_SHARED_REQUESTS_PER_HOST = 8
+# Links followed in parallel from a parsed PDF
+PDF_LINK_CONCURRENCY = 5
+# Pages between crawl progress summaries in scraping_activity.log
+PROGRESS_LOG_INTERVAL = 25
+# HTTP extraction reads at most this much of a page body; the rest is ignored
+MAX_PAGE_BYTES = 10 * 1024 * 1024
+
+# Per-crawl progress, keyed by crawl id; the oldest entries are dropped past CRAWL_STATE_HISTORY
+crawl_states = OrderedDict()
+CRAWL_STATE_HISTORY = 100
+# Crawl reported by the status/stop endpoints when no crawl_id is given
+latest_crawl_id = None
+
+def new_crawl_id() -> str:
+    """Random id for a new crawl; concurrent crawls of the same URL each get their own."""
+    return f"crawl_{secrets.token_hex(6)}"
+
+def start_crawl_state(crawl_id: str) -> dict:
+    """Register a fresh running state for a crawl and make it the latest one."""
+    global latest_crawl_id
+    state = {"crawl_id": crawl_id, "status": "running", "pages_crawled": 0, "success_rate": 0.0, "queue_size": 1}
+    crawl_states[crawl_id] = state
+    latest_crawl_id = crawl_id
+    while len(crawl_states) > CRAWL_STATE_HISTORY:
+        crawl_states.popitem(last=False)
+    return state
 
 # API root endpoint
 @app.get("/api")
@@ -189,55 +391,245 @@ async def health_check():
     return {"status": "healthy", "message": "CrawlOps server is running"}
 
 # Crawling endpoints
-async def crawl_single_page(url: str, crawl_request: CrawlRequest):
-    """Extract content from a single page using browser automation or HTTP fallback."""
+def parse_html_page(html_content: str, url: str) -> dict:
+    """Extract title, text, links and images from an HTML page.
+
+    Uses selectolax when installed, otherwise BeautifulSoup. Runs in a worker
+    process, so it must stay a module-level function.
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html_content)
+        
+        # Extract title
+        title_node = tree.css_first('title')
+        title_text = title_node.text(strip=True) if title_node else "No title"
+        
+        # Extract text content
+        for node in tree.css('script, style'):
+            node.decompose()
+        text_content = tree.root.text(separator=' ', strip=True) if tree.root else ""
+        
+        hrefs = [link.attributes.get('href') or '' for link in tree.css('a[href]')]
+        srcs = [img.attributes.get('src') or '' for img in tree.css('img[src]')]
+    else:
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html_content, 'lxml')
+        
+        # Extract title
+        title_tag = soup.find('title')
+        title_text = title_tag.get_text(strip=True) if title_tag else "No title"
+        
+        # Extract text content
+        for script in soup(["script", "style"]):
+            script.decompose()
+        text_content = soup.get_text(separator=' ', strip=True)
+        
+        hrefs = [link['href'] for link in soup.find_all('a', href=True)]
+        srcs = [img['src'] for img in soup.find_all('img', src=True)]
+    
+    text_content = ' '.join(text_content.split())
+    
+    # Extract links
+    links = []
+    for href in hrefs:
+        absolute_url = urljoin(url, href)
+        clean_url = urldefrag(absolute_url)[0]  # Remove fragments
+        if clean_url and clean_url.startswith(('http://', 'https://')):
+            links.append(clean_url)
+    
+    # Extract images
+    images = [urljoin(url, src) for src in srcs]
+    
+    return {
+        "title": title_text,
+        "content": text_content,
+        "links": links,
+        "images": images
+    }
+
+def dump_json_bytes(data) -> bytes:
+    """Serialize data as indented UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def dumps_compact(data) -> str:
+    """Serialize data as compact JSON text, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+def loads_json(text):
+    """Parse JSON text or bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def b64encode_text(data: bytes) -> str:
+    """Base64-encode bytes to an ASCII str, using pybase64 when installed."""
+    if pybase64 is not None:
+        return pybase64.b64encode(data).decode('ascii')
+    return base64.b64encode(data).decode('ascii')
+
+OUTPUT_WRITE_BUFFER = 1 << 20
+
+def write_json_file(path: Path, data) -> None:
+    """Serialize data and write it to path (blocking; run via asyncio.to_thread)."""
+    with open(path, 'wb', buffering=OUTPUT_WRITE_BUFFER) as f:
+        f.write(dump_json_bytes(data))
+
+def write_text_file(path: Path, parts: Iterable[str]) -> None:
+    """Write text fragments to path (blocking; run via asyncio.to_thread)."""
+    with open(path, 'w', encoding='utf-8', buffering=OUTPUT_WRITE_BUFFER) as f:
+        f.writelines(parts)
+
+def create_crawl_http_session():
+    """Create the pooled HTTP session shared by every page of one crawl."""
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=create_tcp_connector(limit=200, limit_per_host=64),
+        cookie_jar=aiohttp.CookieJar()
+    )
+
+def browser_automation_enabled() -> bool:
+    """Whether crawl4ai browser automation may be used on this platform."""
+    # Windows compatibility: browser automation can be switched off via environment
+    return not (platform.system() == 'Windows' and os.environ.get('DISABLE_BROWSER_AUTOMATION', '0') == '1')
+
+# Enhanced browser headers for HTTP extraction
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0'
+}
+
+@lru_cache(maxsize=256)
+def basic_auth_header(username: str, password: str) -> str:
+    """Authorization header value for HTTP Basic credentials (cached per credential pair)."""
+    return f"Basic {b64encode_text(f'{username}:{password}'.encode())}"
+
+def build_auth_headers(crawl_request: CrawlRequest) -> dict:
+    """Build the authentication and custom headers for a crawl request.
+    
+    Credentials are constant for a crawl, so this runs once per crawl rather
+    than once per page.
+    """
+    auth_headers = {}
+    if crawl_request.auth_type == "bearer" and crawl_request.auth_token:
+        auth_headers["Authorization"] = f"Bearer {crawl_request.auth_token}"
+        scraping_logger.info("Using Bearer token authentication for %s", crawl_request.url)
+    elif crawl_request.auth_type == "basic" and crawl_request.auth_username and crawl_request.auth_password:
+        auth_headers["Authorization"] = basic_auth_header(crawl_request.auth_username, crawl_request.auth_password)
+        scraping_logger.info("Using Basic authentication for %s (user: %s)", crawl_request.url, crawl_request.auth_username)
+    elif crawl_request.auth_type == "custom" and crawl_request.auth_token:
+        auth_headers["Authorization"] = crawl_request.auth_token
+        scraping_logger.info("Using custom authorization header for %s", crawl_request.url)
+    
+    # Add custom headers if provided
+    if crawl_request.custom_headers:
+        auth_headers.update(crawl_request.custom_headers)
+        scraping_logger.info("Added %d custom headers for %s", len(crawl_request.custom_headers), crawl_request.url)
+    
+    return auth_headers
+
+def create_page_crawler(crawl_request: CrawlRequest, auth_headers: Optional[dict] = None):
+    """Create a crawl4ai AsyncWebCrawler configured for a crawl request.
+    
+    The crawler launches Chromium when entered, so one instance should be
+    shared across all pages of a crawl.
+    """
+    from crawl4ai import AsyncWebCrawler
+    
+    crawler_headers = auth_headers if auth_headers is not None else build_auth_headers(crawl_request)
+    
+    return AsyncWebCrawler(
+        headless=False,
+        browser_type="chromium",
+        verbose=True,
+        always_by_pass_cache=True,
+        delay_before_return_html=max(0.1, min(30.0, crawl_request.delay_seconds)),
+        headers=crawler_headers if crawler_headers else None
+    )
+
+# HTTP-extracted pages kept for conditional re-fetches: url -> (validator headers, result, content size).
+# A cached result is only reused after the server answers 304 to that crawl's own request.
+_page_cache = OrderedDict()
+_page_cache_bytes = 0
+PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def remember_page(url: str, validators: dict, result: dict) -> None:
+    """Cache an extracted page under its ETag/Last-Modified validators, evicting the oldest pages."""
+    global _page_cache_bytes
+    size = len(result["content"])
+    if not validators or size > PAGE_CACHE_MAX_BYTES // 8:
+        return
+    previous = _page_cache.pop(url, None)
+    if previous is not None:
+        _page_cache_bytes -= previous[2]
+    _page_cache[url] = (validators, result, size)
+    _page_cache_bytes += size
+    while _page_cache_bytes > PAGE_CACHE_MAX_BYTES:
+        _, (_, _, evicted_size) = _page_cache.popitem(last=False)
+        _page_cache_bytes -= evicted_size
+
+# host -> [semaphore, users]; entries are dropped when their last user finishes
+_host_request_slots = {}
+
+@asynccontextmanager
+async def host_request_slot(url: str):
+    """Hold one of the shared request slots for url's host while fetching it."""
+    host = urlparse(url).netloc.lower()
+    entry = _host_request_slots.get(host)
+    if entry is None:
+        entry = _host_request_slots[host] = [asyncio.Semaphore(MAX_SHARED_REQUESTS_PER_HOST), 0]
+    entry[1] += 1
     try:
-        import asyncio
-        from crawl4ai import AsyncWebCrawler
-        
-        # Apply configurable delay
-        if crawl_request.delay_seconds > 0:
-            delay = max(0.1, min(30.0, crawl_request.delay_seconds))
-            scraping_logger.debug(f"Applying {delay}s delay before crawling {url}")
-            await asyncio.sleep(delay)
-        
-        # Build authentication headers for browser automation
-        crawler_headers = {}
-        if crawl_request.auth_type == "bearer" and crawl_request.auth_token:
-            crawler_headers["Authorization"] = f"Bearer {crawl_request.auth_token}"
-            scraping_logger.info(f"Using Bearer token authentication for browser automation: {url}")
-        elif crawl_request.auth_type == "basic" and crawl_request.auth_username and crawl_request.auth_password:
-            import base64
-            credentials = base64.b64encode(f"{crawl_request.auth_username}:{crawl_request.auth_password}".encode()).decode()
-            crawler_headers["Authorization"] = f"Basic {credentials}"
-            scraping_logger.info(f"Using Basic authentication for browser automation: {url} (user: {crawl_request.auth_username})")
-        elif crawl_request.auth_type == "custom" and crawl_request.auth_token:
-            crawler_headers["Authorization"] = crawl_request.auth_token
-            scraping_logger.info(f"Using custom authorization header for browser automation: {url}")
-        
-        # Add custom headers
-        if crawl_request.custom_headers:
-            crawler_headers.update(crawl_request.custom_headers)
-            scraping_logger.info(f"Added {len(crawl_request.custom_headers)} custom headers for browser automation: {url}")
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _host_request_slots[host]
+
+def request_delay(crawl_request: CrawlRequest) -> float:
+    """The crawl's delay between requests to one host, clamped to 0.1-30s; 0 disables it."""
+    if crawl_request.delay_seconds <= 0:
+        return 0.0
+    return max(0.1, min(30.0, crawl_request.delay_seconds))
 
+async def crawl_single_page(url: str, crawl_request: CrawlRequest, session=None, crawler=None,
+                            use_browser: bool = True, auth_headers: Optional[dict] = None):
+    """Extract content from a single page using browser automation or HTTP fallback.
+    
+    Pass the crawl's shared aiohttp session and AsyncWebCrawler to reuse their
+    connections and browser; without them, temporary ones are opened for this
+    page. use_browser=False goes straight to HTTP extraction. auth_headers are
+    the crawl's precomputed build_auth_headers() result.
+    """
+    try:
+        if auth_headers is None:
+            auth_headers = build_auth_headers(crawl_request)
+        
         # Check Windows compatibility first
-        use_browser_automation = True
-        if platform.system() == 'Windows' and os.environ.get('DISABLE_BROWSER_AUTOMATION', '0') == '1':
-            use_browser_automation = False
-            scraping_logger.info(f"Skipping browser automation for {url} due to Windows compatibility issues")
+        use_browser_automation = use_browser and browser_automation_enabled()
+        if use_browser and not use_browser_automation:
+            scraping_logger.info("Skipping browser automation for %s due to Windows compatibility issues", url)
         
         # Try crawl4ai first with enhanced JavaScript and cookies (if enabled)
         if use_browser_automation:
             try:
-                async with AsyncWebCrawler(
-                    headless=False,
-                    browser_type="chromium",
-                    verbose=True,
-                    always_by_pass_cache=True,
-                    delay_before_return_html=max(0.1, min(30.0, crawl_request.delay_seconds)),
-                    headers=crawler_headers if crawler_headers else None
-                ) as crawler:
-                    result = await crawler.arun(
+                async with nullcontext(crawler) if crawler is not None else create_page_crawler(crawl_request, auth_headers) as page_crawler:
+                    result = await page_crawler.arun(
                         url=url,
                         js_code="window.scrollTo(0, document.body.scrollHeight); await new Promise(resolve => setTimeout(resolve, 2000));",
                         wait_for="body",
@@ -270,100 +662,76 @@ async def crawl_single_page(url: str, crawl_request: CrawlRequest):
                         
             except Exception as browser_error:
                 # Fallback to enhanced HTTP extraction
-                scraping_logger.warning(f"Browser automation failed for {url}: {str(browser_error)}")
-                scraping_logger.info(f"Falling back to HTTP extraction for {url}")
+                scraping_logger.warning("Browser automation failed for %s: %s", url, browser_error)
+                scraping_logger.info("Falling back to HTTP extraction for %s", url)
         else:
-            scraping_logger.info(f"Falling back to HTTP extraction for {url}")
+            scraping_logger.info("Falling back to HTTP extraction for %s", url)
         
         # HTTP extraction fallback (this should always execute when browser automation is disabled or fails)
-        import aiohttp
-        from bs4 import BeautifulSoup
-        from urllib.parse import urljoin, urlparse, urldefrag
-        
-        auth_headers = {}
-        if crawl_request.auth_type == "bearer" and crawl_request.auth_token:
-            auth_headers["Authorization"] = f"Bearer {crawl_request.auth_token}"
-            scraping_logger.info(f"Using Bearer token authentication for {url}")
-        elif crawl_request.auth_type == "basic" and crawl_request.auth_username and crawl_request.auth_password:
-            import base64
-            credentials = base64.b64encode(f"{crawl_request.auth_username}:{crawl_request.auth_password}".encode()).decode()
-            auth_headers["Authorization"] = f"Basic {credentials}"
-            scraping_logger.info(f"Using Basic authentication for {url} (user: {crawl_request.auth_username})")
-        elif crawl_request.auth_type == "custom" and crawl_request.auth_token:
-            auth_headers["Authorization"] = crawl_request.auth_token
-            scraping_logger.info(f"Using custom authorization header for {url}")
-        
-        # Add custom headers if provided
-        if crawl_request.custom_headers:
-            auth_headers.update(crawl_request.custom_headers)
-            scraping_logger.info(f"Added {len(crawl_request.custom_headers)} custom headers for {url}")
-
-        # Enhanced browser headers
-        browser_headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
-        
         # Merge authentication headers with browser headers
-        final_headers = {**browser_headers, **auth_headers}
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            connector=aiohttp.TCPConnector(limit=10),
-            cookie_jar=aiohttp.CookieJar()
-        ) as session:
-            async with session.get(url, headers=final_headers, allow_redirects=True) as response:
-                html_content = await response.text()
-                soup = BeautifulSoup(html_content, 'html.parser')
+        final_headers = {**BROWSER_HEADERS, **auth_headers}
+        
+        # Revalidate pages extracted by an earlier crawl instead of downloading them again
+        cached_page = _page_cache.get(url)
+        if cached_page is not None:
+            final_headers.update(cached_page[0])
+        
+        async with nullcontext(session) if session is not None else create_crawl_http_session() as http_session, \
+                host_request_slot(url):
+            async with http_session.get(url, headers=final_headers, allow_redirects=True) as response:
+                status_code = response.status
+                if cached_page is not None and status_code == 304:
+                    _page_cache.move_to_end(url)
+                    scraping_logger.debug("Not modified since last crawl: %s", url)
+                    return dict(cached_page[1])
+                validators = {}
+                if 'ETag' in response.headers:
+                    validators['If-None-Match'] = response.headers['ETag']
+                if 'Last-Modified' in response.headers:
+                    validators['If-Modified-Since'] = response.headers['Last-Modified']
+                # Skip non-text bodies (images, archives, ...) before reading them
+                content_type = response.content_type
+                if ('Content-Type' in response.headers and 'html' not in content_type and
+                        'xml' not in content_type and not content_type.startswith('text/')):
+                    raise ValueError(f"Unsupported content type {content_type}")
                 
-                # Extract title
-                title_tag = soup.find('title')
-                title_text = title_tag.get_text(strip=True) if title_tag else "No title"
-                
-                # Extract text content
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                text_content = soup.get_text(separator=' ', strip=True)
-                text_content = ' '.join(text_content.split())
-                
-                # Extract links
-                links = []
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    absolute_url = urljoin(url, href)
-                    clean_url = urldefrag(absolute_url)[0]  # Remove fragments
-                    if clean_url and clean_url.startswith(('http://', 'https://')):
-                        links.append(clean_url)
-                
-                # Extract images
-                images = []
-                for img in soup.find_all('img', src=True):
-                    img_url = urljoin(url, img['src'])
-                    images.append(img_url)
-                
-                return {
-                    "success": True,
-                    "title": title_text,
-                    "content": text_content,
-                    "word_count": len(text_content.split()) if text_content else 0,
-                    "links": links[:50],  # Limit to first 50 links
-                    "images": images[:10],  # Limit to first 10 images
-                    "status_code": response.status,
-                    "method": "http_extraction"
-                }
+                # Stream the body up to MAX_PAGE_BYTES so one huge page can't exhaust memory
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                    if len(body) >= MAX_PAGE_BYTES:
+                        scraping_logger.warning("Truncating %s at %d bytes", url, MAX_PAGE_BYTES)
+                        break
+                # Decode with the declared charset, skipping aiohttp's charset detection pass
+                try:
+                    html_content = body.decode(response.charset or 'utf-8', errors='replace')
+                except LookupError:
+                    html_content = body.decode('utf-8', errors='replace')
+        
+        # Parse off the event loop: selectolax is fast enough for a thread (no
+        # pickling of the page), pure-Python BeautifulSoup needs a worker process
+        if LexborHTMLParser is not None:
+            parsed = await asyncio.to_thread(parse_html_page, html_content, url)
+        else:
+            parsed = await run_in_parse_pool(parse_html_page, html_content, url)
+        text_content = parsed["content"]
+        
+        page_result = {
+            "success": True,
+            "title": parsed["title"],
+            "content": text_content,
+            "word_count": len(text_content.split()) if text_content else 0,
+            "links": parsed["links"][:50],  # Limit to first 50 links
+            "images": parsed["images"][:10],  # Limit to first 10 images
+            "status_code": status_code,
+            "method": "http_extraction"
+        }
+        if status_code == 200:
+            remember_page(url, validators, page_result)
+        return dict(page_result)
                     
     except Exception as e:
-        scraping_logger.error(f"Failed to crawl {url}: {str(e)}")
+        scraping_logger.error("Failed to crawl %s: %s", url, e)
         return {
             "success": False,
             "error": str(e),
@@ -373,45 +741,31 @@ async def crawl_single_page(url: str, crawl_request: CrawlRequest):
             "images": []
         }
 
-def apply_scope_filter(url: str, seed_url: str, scope: str) -> bool:
-    """Apply AWS Bedrock-style scope filtering to URLs."""
-    from urllib.parse import urlparse
-    
-    url_parsed = urlparse(url)
-    seed_parsed = urlparse(seed_url)
-    
-    if scope == "default":
-        # Same host and same initial path
-        return (url_parsed.netloc.lower() == seed_parsed.netloc.lower() and 
-                url_parsed.path.startswith(seed_parsed.path))
-    elif scope == "host_only":
-        # Same host only
-        return url_parsed.netloc.lower() == seed_parsed.netloc.lower()
-    elif scope == "subdomains":
-        # Same primary domain (including subdomains)
-        seed_domain_parts = seed_parsed.netloc.lower().split('.')
-        url_domain_parts = url_parsed.netloc.lower().split('.')
-        
-        # Get primary domain (last two parts for .com, .org, etc.)
-        if len(seed_domain_parts) >= 2:
-            seed_primary = '.'.join(seed_domain_parts[-2:])
-            if len(url_domain_parts) >= 2:
-                url_primary = '.'.join(url_domain_parts[-2:])
-                return url_primary == seed_primary
-    
-    return False
+@lru_cache(maxsize=8192)
+def parse_url(url: str):
+    """urlparse() with a cache; crawl URLs are parsed by several filters in turn."""
+    return urlparse(url)
 
-def apply_url_filters(url: str, include_patterns: List[str], exclude_patterns: List[str]) -> bool:
-    """Apply URL filtering patterns with AWS Bedrock-style precedence."""
-    import re
-    
-    # If exclusion patterns match, exclude (exclusion takes precedence)
-    for pattern in exclude_patterns:
+# Binary file types that are never queued for crawling
+BINARY_EXTENSIONS = ('.pdf', '.zip', '.exe', '.dmg', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+                     '.jpg', '.jpeg', '.png', '.gif', '.mp4', '.avi', '.mov')
+
+def compile_url_patterns(patterns: List[str]) -> List[re.Pattern]:
+    """Compile URL filter patterns once per crawl, dropping invalid regexes."""
+    compiled = []
+    for pattern in patterns:
         try:
-            if re.search(pattern, url, re.IGNORECASE):
-                return False
+            compiled.append(re.compile(pattern, re.IGNORECASE))
         except re.error:
-            continue  # Skip invalid regex patterns
+            scraping_logger.warning("Ignoring invalid URL pattern: %s", pattern)
+    return compiled
+
+def apply_url_filters(url: str, include_patterns: List[re.Pattern], exclude_patterns: List[re.Pattern]) -> bool:
+    """Apply compiled URL filtering patterns with AWS Bedrock-style precedence."""
+    # If exclusion patterns match, exclude (exclusion takes precedence)
+    for pattern in exclude_patterns:
+        if pattern.search(url):
+            return False
     
     # If no inclusion patterns, include by default
     if not include_patterns:
@@ -419,102 +773,207 @@ def apply_url_filters(url: str, include_patterns: List[str], exclude_patterns: L
     
     # Check inclusion patterns
     for pattern in include_patterns:
-        try:
-            if re.search(pattern, url, re.IGNORECASE):
-                return True
-        except re.error:
-            continue  # Skip invalid regex patterns
+        if pattern.search(url):
+            return True
     
     return False
 
-async def check_robots_txt(url: str, user_agent: str) -> bool:
-    """Check robots.txt compliance (RFC 9309 standard)."""
-    try:
-        from urllib.parse import urljoin, urlparse
-        import aiohttp
-        
-        parsed_url = urlparse(url)
-        robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status == 200:
-                    robots_content = await response.text()
-                    # Simple robots.txt parsing
-                    lines = robots_content.split('\n')
-                    user_agent_block = False
-                    
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith('#') or not line:
-                            continue
-                        
-                        if line.lower().startswith('user-agent:'):
-                            agent = line.split(':', 1)[1].strip()
-                            user_agent_block = (agent == '*' or agent.lower() in user_agent.lower())
-                        
-                        if user_agent_block and line.lower().startswith('disallow:'):
-                            path = line.split(':', 1)[1].strip()
-                            if path and (path == '/' or parsed_url.path.startswith(path)):
-                                return False
-                    
-                    return True
-        return True  # Allow if robots.txt not found or accessible
-    except:
-        return True  # Allow on any error
+def make_link_filter(seed_parsed, scope: str, include_patterns: List[re.Pattern], exclude_patterns: List[re.Pattern]):
+    """Build the per-crawl predicate deciding whether a discovered link is queued.
+    
+    Combines the scope filter, URL patterns and binary-extension check into one
+    call, with the seed-derived values computed once.
+    """
+    seed_netloc = seed_parsed.netloc.lower()
+    seed_path = seed_parsed.path
+    seed_domain_parts = seed_netloc.split('.')
+    seed_primary = '.'.join(seed_domain_parts[-2:]) if len(seed_domain_parts) >= 2 else None
+    
+    def should_enqueue(link: str) -> bool:
+        link_parsed = parse_url(link)
+        if link_parsed.scheme not in ('http', 'https'):
+            return False
+        
+        # AWS Bedrock-style scope: default = same host and initial path, host_only = same host,
+        # subdomains = same primary domain
+        netloc = link_parsed.netloc.lower()
+        if scope == "default":
+            if netloc != seed_netloc or not link_parsed.path.startswith(seed_path):
+                return False
+        elif scope == "host_only":
+            if netloc != seed_netloc:
+                return False
+        elif scope == "subdomains":
+            if seed_primary is None or not (netloc == seed_primary or netloc.endswith('.' + seed_primary)):
+                return False
+        else:
+            return False
+        
+        if not apply_url_filters(link, include_patterns, exclude_patterns):
+            return False
+        
+        # Basic file type filtering (exclude binary files); the path ignores any query string
+        return not link_parsed.path.lower().endswith(BINARY_EXTENSIONS)
+    
+    return should_enqueue
+
+# Parsed robots.txt per scheme://host, shared by all crawls: host -> (expires_at loop time, parser)
+_robots_cache = OrderedDict()
+# One lock per host while its robots.txt is being fetched
+_robots_locks = {}
+ROBOTS_CACHE_SIZE = 1024
+ROBOTS_CACHE_TTL = 3600.0
+ROBOTS_FAILURE_TTL = 300.0  # Unreachable or 5xx robots.txt is retried sooner
+
+async def check_robots_txt(session, url: str, robots_agent: str) -> bool:
+    """Check robots.txt compliance (RFC 9309 standard).
+    
+    Each host's robots.txt is fetched once and kept as a parsed
+    RobotFileParser in _robots_cache for ROBOTS_CACHE_TTL, so repeated
+    crawls of a site reuse it; concurrent workers wait on the host's lock
+    instead of fetching the same file twice.
+    """
+    parsed_url = parse_url(url)
+    host_key = f"{parsed_url.scheme}://{parsed_url.netloc}"
+    loop = asyncio.get_running_loop()
+    
+    cached = _robots_cache.get(host_key)
+    if cached is None or cached[0] <= loop.time():
+        async with _robots_locks.setdefault(host_key, asyncio.Lock()):
+            cached = _robots_cache.get(host_key)
+            if cached is None or cached[0] <= loop.time():
+                robots_lines = []
+                ttl = ROBOTS_FAILURE_TTL
+                try:
+                    async with session.get(f"{host_key}/robots.txt", timeout=aiohttp.ClientTimeout(total=5)) as response:
+                        if response.status == 200:
+                            robots_lines = (await response.text()).splitlines()
+                        if response.status < 500:
+                            ttl = ROBOTS_CACHE_TTL
+                except Exception:
+                    pass  # Allow if robots.txt not found or accessible
+                parser = RobotFileParser()
+                parser.parse(robots_lines)
+                cached = (loop.time() + ttl, parser)
+                _robots_cache[host_key] = cached
+                _robots_cache.move_to_end(host_key)
+                if len(_robots_cache) > ROBOTS_CACHE_SIZE:
+                    _robots_cache.popitem(last=False)
+                # Waiters keep their reference to this lock; later callers find the fresh entry
+                _robots_locks.pop(host_key, None)
+    
+    return cached[1].can_fetch(robots_agent, url)
 
-async def recursive_crawl(crawl_request: CrawlRequest):
-    """Perform recursive crawling with enterprise-grade scope control and filtering."""
-    from urllib.parse import urlparse, urljoin
-    import re
+async def recursive_crawl(crawl_request: CrawlRequest, crawl_state: Optional[dict] = None):
+    """Perform recursive crawling with enterprise-grade scope control and filtering.
     
+    Pages are fetched by a bounded pool of worker tasks sharing one queue, with
+    a per-host in-flight cap and a per-host rate limit from the crawl request.
+    Progress is published into crawl_state when one is given.
+    """
+    if crawl_state is None:
+        crawl_state = {}
     crawled_urls = set()
-    crawl_queue = [(crawl_request.url, 0)]  # (url, depth)
+    queued_urls = {crawl_request.url}  # Every URL ever put on the queue
+    crawl_queue = asyncio.Queue()  # (url, depth); URLs are scope/pattern-filtered before queueing
     results = []
     pages_crawled = 0
-    rate_limit_tracker = {}  # Track URLs per host per minute
-    user_agent = f"Mozilla/5.0 (compatible; {crawl_request.user_agent_suffix})"
+    success_count = 0
+    last_state_publish = 0.0
+    # Per-URL decisions are counted and logged as periodic progress summaries
+    crawl_stats = {"queued": 0, "filtered": 0, "robots_blocked": 0}
+    # robots.txt groups are matched against the product token; RobotFileParser keeps only the
+    # text before the first "/", so the full "Mozilla/5.0 (...)" string would match "mozilla"
+    robots_agent = crawl_request.user_agent_suffix
+    seed_parsed = parse_url(crawl_request.url)
+    scope = crawl_request.scope
+    include_patterns = compile_url_patterns(crawl_request.include_patterns)
+    exclude_patterns = compile_url_patterns(crawl_request.exclude_patterns)
+    should_enqueue = make_link_filter(seed_parsed, scope, include_patterns, exclude_patterns)
+    auth_headers = build_auth_headers(crawl_request)
+    
+    # Out-links are filtered when queued, so the seed is checked here once; it is always in its own scope
+    if apply_url_filters(crawl_request.url, include_patterns, exclude_patterns):
+        crawl_queue.put_nowait((crawl_request.url, 0))
+    else:
+        scraping_logger.info("Seed URL %s is excluded by URL patterns; nothing to crawl", crawl_request.url)
+    
+    # Per-host limits: in-flight cap plus minimum spacing between request starts
+    host_semaphores = {}
+    host_next_slot = {}
+    # delay_seconds is enforced here per host, so pages on other hosts aren't held back
+    host_interval = max(60.0 / max(crawl_request.max_urls_per_host_per_minute, 1), request_delay(crawl_request))
+    worker_count = max(1, min(crawl_request.concurrency, MAX_CRAWL_CONCURRENCY))
+    loop = asyncio.get_running_loop()
     
     scraping_logger.info(f"Starting enterprise recursive crawl from {crawl_request.url}")
-    scraping_logger.info(f"Config: Depth={crawl_request.max_depth}, Pages={crawl_request.max_pages}, Scope={crawl_request.scope}, RateLimit={crawl_request.max_urls_per_host_per_minute}/min")
+    scraping_logger.info(f"Config: Depth={crawl_request.max_depth}, Pages={crawl_request.max_pages}, Scope={crawl_request.scope}, RateLimit={crawl_request.max_urls_per_host_per_minute}/min, HostInterval={host_interval:.2f}s, Workers={worker_count}")
+    if crawl_request.ignore_robots:
+        scraping_logger.info(f"Ignoring robots.txt for {crawl_request.url} (user override)")
+    
+    async def wait_for_host_slot(host: str):
+        """Reserve the next request slot for a host, sleeping until it opens."""
+        now = loop.time()
+        slot = max(now, host_next_slot.get(host, now))
+        host_next_slot[host] = slot + host_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
     
-    while crawl_queue and pages_crawled < crawl_request.max_pages:
-        current_url, current_depth = crawl_queue.pop(0)
+    def publish_crawl_state(force: bool = False):
+        """Copy progress into this crawl's state, at most every 10 pages or 0.5s."""
+        nonlocal last_state_publish
+        now = loop.time()
+        if not force and pages_crawled % 10 != 0 and now - last_state_publish < 0.5:
+            return
+        last_state_publish = now
+        crawl_state["pages_crawled"] = pages_crawled
+        crawl_state["queue_size"] = crawl_queue.qsize()
+        crawl_state["success_rate"] = success_count / max(pages_crawled, 1)
+    
+    def log_progress():
+        scraping_logger.info(
+            "Progress: crawled=%d/%d succeeded=%d queued=%d filtered=%d robots_blocked=%d pending=%d",
+            pages_crawled, crawl_request.max_pages, success_count, crawl_stats["queued"],
+            crawl_stats["filtered"], crawl_stats["robots_blocked"], crawl_queue.qsize()
+        )
+    
+    async def process_url(current_url: str, current_depth: int):
+        nonlocal pages_crawled, success_count
+        
+        # Stop picking up new work once the page budget is used
+        if pages_crawled >= crawl_request.max_pages:
+            return
         
         # Skip if already crawled or depth exceeded
         if current_url in crawled_urls or current_depth > crawl_request.max_depth:
-            continue
-        
-        # Apply enterprise scope filtering
-        if not apply_scope_filter(current_url, crawl_request.url, crawl_request.scope):
-            scraping_logger.debug(f"Skipping {current_url} - outside scope ({crawl_request.scope})")
-            continue
-        
-        # Apply URL filtering patterns
-        if not apply_url_filters(current_url, crawl_request.include_patterns, crawl_request.exclude_patterns):
-            scraping_logger.debug(f"Skipping {current_url} - filtered by URL patterns")
-            continue
+            return
         
         # Check robots.txt compliance if enabled and not being ignored
         if not crawl_request.ignore_robots and crawl_request.respect_robots_txt:
-            if not await check_robots_txt(current_url, user_agent):
-                scraping_logger.info(f"Skipping {current_url} - blocked by robots.txt")
-                continue
-        elif crawl_request.ignore_robots:
-            scraping_logger.info(f"Ignoring robots.txt for {current_url} (user override)")
+            if not await check_robots_txt(session, current_url, robots_agent):
+                crawl_stats["robots_blocked"] += 1
+                scraping_logger.info("Skipping %s - blocked by robots.txt", current_url)
+                return
+        
+        # Re-check after the robots.txt await: another worker may have taken the URL or the last slot
+        if current_url in crawled_urls or pages_crawled >= crawl_request.max_pages:
+            return
         
         crawled_urls.add(current_url)
         pages_crawled += 1
+        crawl_order = pages_crawled
+        publish_crawl_state()
         
-        # Update crawl state
-        crawl_state["pages_crawled"] = pages_crawled
-        crawl_state["queue_size"] = len(crawl_queue)
-        crawl_state["success_rate"] = len([r for r in results if r.get("success", False)]) / max(pages_crawled, 1)
-        
-        scraping_logger.info(f"Crawling [{pages_crawled}/{crawl_request.max_pages}] depth {current_depth}: {current_url}")
+        scraping_logger.debug("Crawling [%d/%d] depth %d: %s", crawl_order, crawl_request.max_pages, current_depth, current_url)
+        if crawl_order % PROGRESS_LOG_INTERVAL == 0:
+            log_progress()
         
-        # Crawl the current page
-        page_result = await crawl_single_page(current_url, crawl_request)
+        # Crawl the current page within the per-host limits
+        host = parse_url(current_url).netloc.lower()
+        host_semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(MAX_REQUESTS_PER_HOST))
+        async with host_semaphore:
+            await wait_for_host_slot(host)
+            page_result = await crawl_single_page(current_url, crawl_request, session, crawler, crawler is not None, auth_headers)
         
         # Ensure page_result is a dictionary before assignment (fix NoneType error)
         if not page_result or not isinstance(page_result, dict):
@@ -529,51 +988,118 @@ async def recursive_crawl(crawl_request: CrawlRequest):
             
         page_result["url"] = current_url
         page_result["depth"] = current_depth
-        page_result["crawl_order"] = pages_crawled
+        page_result["crawl_order"] = crawl_order
         results.append(page_result)
+        if page_result.get("success", False):
+            success_count += 1
         
-        # If successful and not at max depth, add links to queue
-        if page_result.get("success", False) and current_depth < crawl_request.max_depth:
+        # If successful, not at max depth and the page budget isn't used up, add links to queue
+        if (page_result.get("success", False) and current_depth < crawl_request.max_depth and
+                pages_crawled < crawl_request.max_pages):
             links = page_result.get("links", [])
             added_links = 0
             for link in links:
                 if added_links >= 20:  # Limit to 20 links per page to avoid explosion
                     break
                     
-                if link not in crawled_urls and link not in [url for url, _ in crawl_queue]:
-                    # Apply scope filter to new links
-                    if apply_scope_filter(link, crawl_request.url, crawl_request.scope):
-                        # Apply URL filtering
-                        if apply_url_filters(link, crawl_request.include_patterns, crawl_request.exclude_patterns):
-                            # Basic file type filtering (exclude binary files)
-                            if not re.search(r'\.(pdf|zip|exe|dmg|doc|docx|xls|xlsx|ppt|pptx|jpg|jpeg|png|gif|mp4|avi|mov)$', link, re.I):
-                                crawl_queue.append((link, current_depth + 1))
-                                added_links += 1
-                                scraping_logger.debug(f"Added to queue: {link} (depth {current_depth + 1})")
+                if link in crawled_urls or link in queued_urls:
+                    continue
+                if not should_enqueue(link):
+                    crawl_stats["filtered"] += 1
+                    continue
+                queued_urls.add(link)
+                crawl_queue.put_nowait((link, current_depth + 1))
+                added_links += 1
+                crawl_stats["queued"] += 1
+    
+    async def worker():
+        while True:
+            current_url, current_depth = await crawl_queue.get()
+            try:
+                await process_url(current_url, current_depth)
+            except Exception as e:
+                scraping_logger.error("Crawl worker failed on %s: %s", current_url, e)
+            finally:
+                crawl_queue.task_done()
     
+    async with AsyncExitStack() as stack:
+        session = await stack.enter_async_context(create_crawl_http_session())
+        
+        # One browser for the whole crawl; if it can't start, every page uses HTTP extraction
+        crawler = None
+        if browser_automation_enabled():
+            try:
+                crawler = await stack.enter_async_context(create_page_crawler(crawl_request, auth_headers))
+            except Exception as e:
+                scraping_logger.warning(f"Browser automation unavailable for this crawl, using HTTP extraction: {e}")
+        
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+        try:
+            await crawl_queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    publish_crawl_state(force=True)
+    log_progress()
+    
+    # Workers finish out of order; report pages in the order they were started
+    results.sort(key=lambda r: r["crawl_order"])
     return results
 
+def iter_text_export(pages: List[dict]) -> Iterator[str]:
+    """Yield the plain-text crawl export page by page."""
+    for result in pages:
+        yield f"\n\n=== {result.get('title', 'Untitled')} ({result.get('url', '')}) ===\n"
+        yield result.get("content", "")
+
+def iter_markdown_export(pages: List[dict]) -> Iterator[str]:
+    """Yield the markdown crawl export page by page."""
+    for result in pages:
+        yield f"\n\n# {result.get('title', 'Untitled')}\n**URL:** {result.get('url', '')}\n**Words:** {result.get('word_count', 0)}\n\n"
+        yield result.get("content", "")
+
+def iter_html_export(pages: List[dict]) -> Iterator[str]:
+    """Yield the HTML crawl export page by page.
+    
+    Page content is yielded on its own so it is never copied into a
+    per-page fragment.
+    """
+    yield "<html><head><title>Recursive Crawl Results</title></head><body>"
+    for result in pages:
+        page_url = result.get('url', '')
+        yield (
+            f"<div style='margin: 20px 0; border-bottom: 1px solid #ccc; padding-bottom: 20px;'>"
+            f"<h2>{result.get('title', 'Untitled')}</h2>"
+            f"<p><strong>URL:</strong> <a href='{page_url}'>{page_url}</a></p>"
+            f"<p><strong>Words:</strong> {result.get('word_count', 0)}</p>"
+            f"<div>"
+        )
+        yield result.get("content", "")
+        yield "</div></div>"
+    yield "</body></html>"
+
 @app.post("/api/crawl/start")
 async def start_crawl(crawl_request: CrawlRequest, background_tasks: BackgroundTasks):
     """Start a new crawl operation with recursive crawling support."""
     api_logger.info(f"Crawl request received: {crawl_request.url}")
     scraping_logger.info(f"Starting crawl for {crawl_request.url} - Max Depth: {crawl_request.max_depth}, Max Pages: {crawl_request.max_pages}, Ignore Robots: {crawl_request.ignore_robots}")
     
+    crawl_state = None
     try:
         # Validate URL
         if not crawl_request.url.startswith(("http://", "https://")):
             api_logger.error(f"Invalid URL format: {crawl_request.url}")
             raise HTTPException(status_code=400, detail="Invalid URL format")
         
-        # Update crawl state
-        crawl_state["status"] = "running"
-        crawl_state["pages_crawled"] = 0
-        crawl_state["queue_size"] = 1
-        crawl_state["success_rate"] = 0.0
-        scraping_logger.debug(f"Crawl state updated: {crawl_state}")
+        # Concurrent crawls each report progress under their own id
+        crawl_id = new_crawl_id()
+        crawl_state = start_crawl_state(crawl_id)
+        scraping_logger.debug("Crawl state updated: %s", crawl_state)
         
         # Perform recursive crawling
-        crawl_results = await recursive_crawl(crawl_request)
+        crawl_results = await recursive_crawl(crawl_request, crawl_state)
         
         # Process results - ensure proper success tracking
         successful_pages = [r for r in crawl_results if r.get("success", False)]
@@ -582,40 +1108,26 @@ async def start_crawl(crawl_request: CrawlRequest, background_tasks: BackgroundT
         scraping_logger.info(f"Crawl results processed: {len(successful_pages)} successful, {len(failed_pages)} failed, {len(crawl_results)} total")
         
         total_words = sum(r.get("word_count", 0) for r in successful_pages)
-        all_links = []
-        all_images = []
         
-        for result in successful_pages:
-            all_links.extend(result.get("links", []))
-            all_images.extend(result.get("images", []))
-        
-        # Remove duplicates while preserving order
-        unique_links = list(dict.fromkeys(all_links))
-        unique_images = list(dict.fromkeys(all_images))
-        
-        # Create combined content for export
-        combined_content = ""
-        combined_markdown = ""
-        combined_html = "<html><head><title>Recursive Crawl Results</title></head><body>"
+        # Insertion-ordered dicts deduplicate links/images as pages are processed
+        seen_links = {}
+        seen_images = {}
         
         for result in successful_pages:
-            combined_content += f"\n\n=== {result.get('title', 'Untitled')} ({result.get('url', '')}) ===\n"
-            combined_content += result.get("content", "")
-            
-            combined_markdown += f"\n\n# {result.get('title', 'Untitled')}\n"
-            combined_markdown += f"**URL:** {result.get('url', '')}\n"
-            combined_markdown += f"**Words:** {result.get('word_count', 0)}\n\n"
-            combined_markdown += result.get("content", "")
-            
-            combined_html += f"<div style='margin: 20px 0; border-bottom: 1px solid #ccc; padding-bottom: 20px;'>"
-            combined_html += f"<h2>{result.get('title', 'Untitled')}</h2>"
-            combined_html += f"<p><strong>URL:</strong> <a href='{result.get('url', '')}'>{result.get('url', '')}</a></p>"
-            combined_html += f"<p><strong>Words:</strong> {result.get('word_count', 0)}</p>"
-            combined_html += f"<div>{result.get('content', '')}</div></div>"
-        
-        combined_html += "</body></html>"
+            for link in result.get("links", []):
+                seen_links.setdefault(link, None)
+            for image in result.get("images", []):
+                seen_images.setdefault(image, None)
+        
+        # Create combined content for export (the frontend downloads these from the response)
+        combined_content = "".join(iter_text_export(successful_pages))
+        combined_markdown = "".join(iter_markdown_export(successful_pages))
+        combined_html = "".join(iter_html_export(successful_pages))
+        unique_links = list(seen_links)
+        unique_images = list(seen_images)
         
         # Initialize variables for all cases
+        crawl_finished_at = datetime.now()
         crawl_data = {
             "crawl_summary": {
                 "start_url": crawl_request.url,
@@ -629,36 +1141,27 @@ async def start_crawl(crawl_request: CrawlRequest, background_tasks: BackgroundT
             },
             "pages": crawl_results,
             "combined_content": combined_content,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": crawl_finished_at.isoformat()
         }
         files_saved = []
         
         # Save to output folder if there are successful results
         if successful_pages:
-            output_dir = Path("./crawl_output")
-            output_dir.mkdir(exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_dir = OUTPUT_DIR
+            timestamp = crawl_finished_at.strftime("%Y%m%d_%H%M%S")
             base_name = crawl_request.url.replace("https://", "").replace("http://", "").replace("/", "_").replace(".", "_")[:30]
             
-            # Save combined results
-            import json as json_module
-            
+            # Save combined results off the event loop, all four files concurrently
             json_file = output_dir / f"recursive_crawl_{base_name}_{timestamp}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json_module.dump(crawl_data, f, indent=2, ensure_ascii=False)
-            
             md_file = output_dir / f"recursive_crawl_{base_name}_{timestamp}.md"
-            with open(md_file, 'w', encoding='utf-8') as f:
-                f.write(combined_markdown)
-            
             html_file = output_dir / f"recursive_crawl_{base_name}_{timestamp}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(combined_html)
-            
             txt_file = output_dir / f"recursive_crawl_{base_name}_{timestamp}.txt"
-            with open(txt_file, 'w', encoding='utf-8') as f:
-                f.write(combined_content)
+            await asyncio.gather(
+                asyncio.to_thread(write_json_file, json_file, crawl_data),
+                asyncio.to_thread(write_text_file, md_file, iter_markdown_export(successful_pages)),
+                asyncio.to_thread(write_text_file, html_file, iter_html_export(successful_pages)),
+                asyncio.to_thread(write_text_file, txt_file, iter_text_export(successful_pages)),
+            )
             
             files_saved = [json_file.name, md_file.name, html_file.name, txt_file.name]
             scraping_logger.info(f"Recursive crawl completed: {len(successful_pages)} pages, {total_words} words, files saved: {files_saved}")
@@ -672,7 +1175,7 @@ async def start_crawl(crawl_request: CrawlRequest, background_tasks: BackgroundT
         return {
             "success": True,
             "message": f"Recursive crawl completed: {len(successful_pages)} successful pages out of {len(crawl_results)} total",
-            "crawl_id": f"crawl_{hash(crawl_request.url) % 10000}",
+            "crawl_id": crawl_id,
             "url": crawl_request.url,
             "meta": {
                 "total_pages": len(crawl_results),
@@ -704,23 +1207,38 @@ async def start_crawl(crawl_request: CrawlRequest, background_tasks: BackgroundT
         logger.error(f"Failed to start recursive crawl: {e}")
         
         # Update crawl state on failure
-        crawl_state["status"] = "failed"
-        crawl_state["queue_size"] = 0
+        if crawl_state is not None:
+            crawl_state["status"] = "failed"
+            crawl_state["queue_size"] = 0
         raise HTTPException(status_code=500, detail=f"Failed to start crawl: {str(e)}")
 
+def find_crawl_state(crawl_id: Optional[str]) -> Optional[dict]:
+    """State of the given crawl, or of the latest one; 404 for an unknown crawl_id."""
+    if crawl_id is None:
+        return crawl_states.get(latest_crawl_id)
+    state = crawl_states.get(crawl_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Unknown crawl_id: {crawl_id}")
+    return state
+
 @app.post("/api/crawl/stop")
-async def stop_crawl():
-    """Stop the current crawl operation."""
-    crawl_state["status"] = "stopped"
-    crawl_state["queue_size"] = 0
+async def stop_crawl(crawl_id: Optional[str] = None):
+    """Stop a crawl operation (the latest one unless crawl_id is given)."""
+    crawl_state = find_crawl_state(crawl_id)
+    if crawl_state is not None:
+        crawl_state["status"] = "stopped"
+        crawl_state["queue_size"] = 0
     return {
         "success": True,
         "message": "Crawl stopped successfully"
     }
 
 @app.get("/api/crawl/status")
-async def get_crawl_status():
-    """Get current crawl status."""
+async def get_crawl_status(crawl_id: Optional[str] = None):
+    """Get a crawl's status (the latest crawl unless crawl_id is given)."""
+    crawl_state = find_crawl_state(crawl_id)
+    if crawl_state is None:
+        return CrawlStatus(status="stopped")
     return CrawlStatus(**crawl_state)
 
 @app.get("/api/export/csv")
@@ -788,18 +1306,54 @@ async def extract_content(crawl_request: CrawlRequest, background_tasks: Backgro
     """Extract content from URL (same as crawl/start)."""
     return await start_crawl(crawl_request, background_tasks)
 
+# Sub-resources fetched by SingleFile: url -> (validator headers, (data, content_type, charset), size).
+# Entries are always revalidated, so a 304 only reuses bytes the server has just confirmed.
+_subresource_cache = OrderedDict()
+_subresource_cache_bytes = 0
+SUBRESOURCE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# CSS references rewritten by SingleFile
+# The URL character classes stop at ')' so one reference can't run on into the next
+CSS_IMPORT_RE = re.compile(r'@import\s+url\(["\']?([^"\')]+)["\']?\);?')
+CSS_FONT_RE = re.compile(r'url\(["\']?([^"\')]+\.(?:woff2?|ttf|eot|otf))["\']?\)')
+CSS_BG_RE = re.compile(r'url\(["\']?([^"\')]+\.(?:png|jpg|jpeg|gif|svg|webp))["\']?\)')
+# Script sources dropped from captures: analytics and social trackers that break offline viewing
+TRACKER_SCRIPT_RE = re.compile(r'google-analytics|googletagmanager|facebook|twitter|doubleclick|hotjar|segment\.io')
+
+@lru_cache(maxsize=1)
+def external_resource_xpaths():
+    """Compiled XPath queries for <link href> and <img src> elements that still need inlining,
+    and for external <script src> elements."""
+    from lxml import etree
+    
+    # Filtering empty and data: references inside libxml2 avoids a Python check per element
+    return (
+        etree.XPath('//link[@href != "" and not(starts-with(@href, "data:"))]'),
+        etree.XPath('//img[@src != "" and not(starts-with(@src, "data:"))]'),
+        etree.XPath('//script[@src != ""]'),
+    )
+
+def remember_subresource(url: str, validators: dict, result: tuple) -> None:
+    """Cache a fetched sub-resource under its ETag/Last-Modified validators, evicting the oldest."""
+    global _subresource_cache_bytes
+    size = len(result[0])
+    if not validators or size > SUBRESOURCE_CACHE_MAX_BYTES // 8:
+        return
+    previous = _subresource_cache.pop(url, None)
+    if previous is not None:
+        _subresource_cache_bytes -= previous[2]
+    _subresource_cache[url] = (validators, result, size)
+    _subresource_cache_bytes += size
+    while _subresource_cache_bytes > SUBRESOURCE_CACHE_MAX_BYTES:
+        _, (_, _, evicted_size) = _subresource_cache.popitem(last=False)
+        _subresource_cache_bytes -= evicted_size
+
 # SingleFile endpoint for rich HTML capture
 @app.post("/api/singlefile")
 async def singlefile_capture(crawl_request: CrawlRequest):
     """Capture rich HTML with CSS, images, fonts, and JavaScript embedded for offline viewing."""
     try:
-        import aiohttp
-        from bs4 import BeautifulSoup
-        import base64
-        import re
-        import mimetypes
-        from urllib.parse import urljoin, urlparse
-        from datetime import datetime
+        import lxml.html
         
         start_time = datetime.now()
         resources_inlined = []
@@ -826,10 +1380,7 @@ async def singlefile_capture(crawl_request: CrawlRequest):
             if crawl_request.auth_type == 'bearer' and hasattr(crawl_request, 'auth_token'):
                 auth_headers['Authorization'] = f"Bearer {crawl_request.auth_token}"
             elif crawl_request.auth_type == 'basic' and hasattr(crawl_request, 'auth_username'):
-                import base64
-                credentials = f"{crawl_request.auth_username}:{crawl_request.auth_password or ''}"
-                encoded = base64.b64encode(credentials.encode()).decode()
-                auth_headers['Authorization'] = f"Basic {encoded}"
+                auth_headers['Authorization'] = basic_auth_header(crawl_request.auth_username, crawl_request.auth_password or '')
             elif crawl_request.auth_type == 'custom' and hasattr(crawl_request, 'auth_token'):
                 auth_headers['Authorization'] = crawl_request.auth_token
         
@@ -838,150 +1389,251 @@ async def singlefile_capture(crawl_request: CrawlRequest):
         # Add custom headers if provided
         if hasattr(crawl_request, 'custom_headers') and crawl_request.custom_headers:
             try:
-                import json
                 custom = json.loads(crawl_request.custom_headers)
                 headers.update(custom)
             except:
                 pass
         
-        timeout = aiohttp.ClientTimeout(total=30)
-        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-            # Get the main page with enhanced browser simulation
-            async with session.get(crawl_request.url) as response:
-                html_content = await response.text()
-                base_url = str(response.url)
-                
-            soup = BeautifulSoup(html_content, 'html.parser')
+        # Shared pooled session; keep-alive connections are reused across captures
+        session = get_http_session()
+        # Get the main page with enhanced browser simulation
+        async with host_request_slot(crawl_request.url), session.get(crawl_request.url, headers=headers) as response:
+            # Stream at most MAX_PAGE_BYTES of the document, like HTTP extraction does
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(65536):
+                body.extend(chunk)
+                if len(body) >= MAX_PAGE_BYTES:
+                    logger.warning("Truncating SingleFile capture of %s at %d bytes", crawl_request.url, MAX_PAGE_BYTES)
+                    break
+            html_bytes = bytes(body)
+            charset = response.charset
+            base_url = str(response.url)
+        
+        # Hand the raw bytes and declared charset to lxml to skip a decode/sniff pass
+        html_parser = lxml.html.HTMLParser(encoding=charset) if charset else None
+        tree = lxml.html.document_fromstring(html_bytes, parser=html_parser)
+        
+        # Add SingleFile metadata
+        head = tree.find('head')
+        if head is not None:
+            head.insert(0, lxml.html.Element('meta', name='singlefile-captured', content=start_time.isoformat()))
+        
+        # Sub-resources are fetched concurrently, at most 10 at a time
+        fetch_semaphore = asyncio.Semaphore(10)
+        
+        async def fetch_resource(resource_url: str, max_bytes: Optional[int] = None):
+            """Fetch a sub-resource; returns (data, content_type, charset) or None.
             
-            # Add SingleFile metadata
-            meta_tag = soup.new_tag('meta', attrs={'name': 'singlefile-captured', 'content': start_time.isoformat()})
-            if soup.head:
-                soup.head.insert(0, meta_tag)
+            Resources of max_bytes or more are abandoned as soon as that is
+            known (from Content-Length, or while streaming) instead of being
+            downloaded in full and discarded. Responses are kept in
+            _subresource_cache and later fetches send a conditional request.
+            """
+            cached = _subresource_cache.get(resource_url)
+            request_headers = {**headers, **cached[0]} if cached is not None else headers
+            try:
+                async with fetch_semaphore, host_request_slot(resource_url):
+                    async with session.get(resource_url, headers=request_headers) as resource_response:
+                        if cached is not None and resource_response.status == 304:
+                            _subresource_cache.move_to_end(resource_url)
+                            if max_bytes is not None and cached[2] >= max_bytes:
+                                return None
+                            return cached[1]
+                        if resource_response.status != 200:
+                            return None
+                        if max_bytes is None:
+                            data = await resource_response.read()
+                        else:
+                            declared_length = resource_response.content_length
+                            if declared_length is not None and declared_length >= max_bytes:
+                                return None
+                            chunks = []
+                            received = 0
+                            async for chunk in resource_response.content.iter_chunked(65536):
+                                received += len(chunk)
+                                if received >= max_bytes:
+                                    return None
+                                chunks.append(chunk)
+                            data = b''.join(chunks)
+                        result = data, resource_response.headers.get('content-type'), resource_response.charset
+                        validators = {}
+                        if 'ETag' in resource_response.headers:
+                            validators['If-None-Match'] = resource_response.headers['ETag']
+                        if 'Last-Modified' in resource_response.headers:
+                            validators['If-Modified-Since'] = resource_response.headers['Last-Modified']
+                        remember_subresource(resource_url, validators, result)
+                        return result
+            except Exception as e:
+                logger.debug("Failed to fetch %s: %s", resource_url, e)
+                return None
+        
+        # A URL referenced several times in one page is fetched once; identical bytes are encoded once
+        fetch_tasks = {}
+        data_uris = {}
+        
+        def fetch_once(resource_url: str, max_bytes: Optional[int] = None):
+            """Share one fetch_resource task between all references to the same URL and size limit."""
+            key = (resource_url, max_bytes)
+            task = fetch_tasks.get(key)
+            if task is None:
+                task = fetch_tasks[key] = asyncio.ensure_future(fetch_resource(resource_url, max_bytes))
+            return task
+        
+        def data_uri(content_type: str, data: bytes) -> str:
+            """Base64 data URI for a fetched resource, encoded once per content and type.
             
-            # Inline CSS files (external stylesheets)
-            for link in soup.find_all('link', rel='stylesheet'):
-                href = link.get('href')
-                if href and not href.startswith('data:'):
-                    css_url = urljoin(base_url, href)
-                    try:
-                        async with session.get(css_url) as css_response:
-                            if css_response.status == 200:
-                                css_content = await css_response.text()
-                                
-                                # Process @import statements in CSS
-                                import_pattern = r'@import\s+url\(["\']?([^"\']+)["\']?\);?'
-                                for match in re.finditer(import_pattern, css_content):
-                                    import_url = urljoin(css_url, match.group(1))
-                                    try:
-                                        async with session.get(import_url) as import_response:
-                                            if import_response.status == 200:
-                                                import_css = await import_response.text()
-                                                css_content = css_content.replace(match.group(0), import_css)
-                                    except:
-                                        pass
-                                
-                                # Process font URLs in CSS
-                                font_pattern = r'url\(["\']?([^"\']+\.(?:woff2?|ttf|eot|otf))["\']?\)'
-                                for match in re.finditer(font_pattern, css_content):
-                                    font_url = urljoin(css_url, match.group(1))
-                                    try:
-                                        async with session.get(font_url) as font_response:
-                                            if font_response.status == 200:
-                                                font_data = await font_response.read()
-                                                if len(font_data) < 200000:  # Inline fonts under 200KB
-                                                    content_type = font_response.headers.get('content-type', 'font/woff2')
-                                                    if not content_type.startswith('font/'):
-                                                        # Guess font type from extension
-                                                        if '.woff2' in font_url:
-                                                            content_type = 'font/woff2'
-                                                        elif '.woff' in font_url:
-                                                            content_type = 'font/woff'
-                                                        elif '.ttf' in font_url:
-                                                            content_type = 'font/ttf'
-                                                    
-                                                    b64_font = base64.b64encode(font_data).decode()
-                                                    data_url = f"data:{content_type};base64,{b64_font}"
-                                                    css_content = css_content.replace(match.group(0), f'url({data_url})')
-                                                    resources_inlined.append('font')
-                                    except:
-                                        pass
-                                
-                                # Process background images in CSS
-                                bg_pattern = r'url\(["\']?([^"\']+\.(?:png|jpg|jpeg|gif|svg|webp))["\']?\)'
-                                for match in re.finditer(bg_pattern, css_content):
-                                    img_url = urljoin(css_url, match.group(1))
-                                    try:
-                                        async with session.get(img_url) as img_response:
-                                            if img_response.status == 200:
-                                                img_data = await img_response.read()
-                                                if len(img_data) < 100000:  # Inline background images under 100KB
-                                                    content_type = img_response.headers.get('content-type')
-                                                    if not content_type:
-                                                        content_type, _ = mimetypes.guess_type(img_url)
-                                                    if content_type and content_type.startswith('image/'):
-                                                        b64_img = base64.b64encode(img_data).decode()
-                                                        data_url = f"data:{content_type};base64,{b64_img}"
-                                                        css_content = css_content.replace(match.group(0), f'url({data_url})')
-                                                        resources_inlined.append('bg-image')
-                                    except:
-                                        pass
-                                
-                                # Create style tag and replace link
-                                style_tag = soup.new_tag('style', attrs={'data-singlefile-css': href})
-                                style_tag.string = css_content
-                                link.replace_with(style_tag)
-                                resources_inlined.append('css')
-                    except Exception as e:
-                        logger.debug(f"Failed to inline CSS {css_url}: {e}")
+            Keying on a digest of the bytes rather than the URL also covers the
+            same file served under several URLs (CDN aliases, cache-busting queries).
+            """
+            key = (content_type, hashlib.blake2b(data, digest_size=16).digest())
+            uri = data_uris.get(key)
+            if uri is None:
+                uri = data_uris[key] = f"data:{content_type};base64,{b64encode_text(data)}"
+            return uri
+        
+        async def inline_stylesheet(css_url: str):
+            """Fetch a stylesheet and inline its @imports, fonts and background images."""
+            fetched = await fetch_once(css_url)
+            if fetched is None:
+                return None
+            css_data, _, css_charset = fetched
+            css_content = css_data.decode(css_charset or 'utf-8', errors='replace')
             
-            # Inline images (img tags)
-            for img in soup.find_all('img'):
-                src = img.get('src')
-                if src and not src.startswith('data:'):
-                    img_url = urljoin(base_url, src)
-                    try:
-                        async with session.get(img_url) as img_response:
-                            if img_response.status == 200:
-                                img_data = await img_response.read()
-                                if len(img_data) < 500000:  # Inline images under 500KB
-                                    content_type = img_response.headers.get('content-type')
-                                    if not content_type:
-                                        content_type, _ = mimetypes.guess_type(img_url)
-                                    if content_type and content_type.startswith('image/'):
-                                        b64_data = base64.b64encode(img_data).decode()
-                                        img['src'] = f"data:{content_type};base64,{b64_data}"
-                                        resources_inlined.append('image')
-                    except Exception as e:
-                        logger.debug(f"Failed to inline image {img_url}: {e}")
+            # Process @import statements in CSS; each distinct reference is fetched once
+            import_refs = list(dict.fromkeys(match.group(1) for match in CSS_IMPORT_RE.finditer(css_content)))
+            imported = await asyncio.gather(*(fetch_once(urljoin(css_url, ref)) for ref in import_refs))
+            import_texts = {}
+            for ref, import_fetched in zip(import_refs, imported):
+                if import_fetched is not None:
+                    import_data, _, import_charset = import_fetched
+                    import_texts[ref] = import_data.decode(import_charset or 'utf-8', errors='replace')
+            if import_texts:
+                css_content = CSS_IMPORT_RE.sub(lambda match: import_texts.get(match.group(1), match.group(0)), css_content)
             
-            # Inline favicon
-            for link in soup.find_all('link', rel=lambda x: x and 'icon' in x):
-                href = link.get('href')
-                if href and not href.startswith('data:'):
-                    icon_url = urljoin(base_url, href)
-                    try:
-                        async with session.get(icon_url) as icon_response:
-                            if icon_response.status == 200:
-                                icon_data = await icon_response.read()
-                                if len(icon_data) < 50000:  # Inline small favicons
-                                    content_type = icon_response.headers.get('content-type', 'image/x-icon')
-                                    b64_data = base64.b64encode(icon_data).decode()
-                                    link['href'] = f"data:{content_type};base64,{b64_data}"
-                                    resources_inlined.append('favicon')
-                    except:
-                        pass
+            # Process font URLs and background images in CSS
+            font_refs = list(dict.fromkeys(match.group(1) for match in CSS_FONT_RE.finditer(css_content)))
+            bg_refs = list(dict.fromkeys(match.group(1) for match in CSS_BG_RE.finditer(css_content)))
+            fonts, backgrounds = await asyncio.gather(
+                # Inline fonts under 200KB
+                asyncio.gather(*(fetch_once(urljoin(css_url, ref), 200000) for ref in font_refs)),
+                # Inline background images under 100KB
+                asyncio.gather(*(fetch_once(urljoin(css_url, ref), 100000) for ref in bg_refs))
+            )
+            
+            font_data_urls = {}
+            for ref, font_fetched in zip(font_refs, fonts):
+                if font_fetched is None:
+                    continue
+                font_data, content_type, _ = font_fetched
+                font_url = urljoin(css_url, ref)
+                content_type = content_type or 'font/woff2'
+                if not content_type.startswith('font/'):
+                    # Guess font type from extension
+                    if '.woff2' in font_url:
+                        content_type = 'font/woff2'
+                    elif '.woff' in font_url:
+                        content_type = 'font/woff'
+                    elif '.ttf' in font_url:
+                        content_type = 'font/ttf'
+                font_data_urls[ref] = data_uri(content_type, font_data)
             
-            # Remove external script tags that might break offline viewing
-            for script in soup.find_all('script', src=True):
-                src = script.get('src')
-                if src and any(domain in src for domain in ['google-analytics', 'googletagmanager', 'facebook', 'twitter']):
-                    script.decompose()
+            bg_data_urls = {}
+            for ref, bg_fetched in zip(bg_refs, backgrounds):
+                if bg_fetched is None:
+                    continue
+                img_data, content_type, _ = bg_fetched
+                bg_url = urljoin(css_url, ref)
+                if not content_type:
+                    content_type, _ = mimetypes.guess_type(bg_url)
+                if content_type and content_type.startswith('image/'):
+                    bg_data_urls[ref] = data_uri(content_type, img_data)
+            
+            def inline_reference(data_urls: dict, kind: str):
+                """re.sub replacer swapping a url(...) reference for its data URI."""
+                def replace(match):
+                    data_url = data_urls.get(match.group(1))
+                    if data_url is None:
+                        return match.group(0)
+                    resources_inlined.append(kind)
+                    return f'url({data_url})'
+                return replace
             
-            # Add SingleFile signature comment
-            capture_time = datetime.now()
-            elapsed = (capture_time - start_time).total_seconds()
+            # One rewriting pass per pattern instead of a full-string replace per reference
+            if font_data_urls:
+                css_content = CSS_FONT_RE.sub(inline_reference(font_data_urls, 'font'), css_content)
+            if bg_data_urls:
+                css_content = CSS_BG_RE.sub(inline_reference(bg_data_urls, 'bg-image'), css_content)
             
-            signature = f"""
+            return css_content
+        
+        async def safe_inline_stylesheet(css_url: str):
+            try:
+                return await inline_stylesheet(css_url)
+            except Exception as e:
+                logger.debug("Failed to inline CSS %s: %s", css_url, e)
+                return None
+        
+        # Collect every external resource first, then fetch them all at once
+        stylesheet_links = []
+        icon_links = []
+        link_xpath, img_xpath, script_xpath = external_resource_xpaths()
+        for link in link_xpath(tree):
+            rel_values = (link.get('rel') or '').lower().split()
+            if 'stylesheet' in rel_values:
+                stylesheet_links.append(link)
+            elif any('icon' in rel for rel in rel_values):
+                icon_links.append(link)
+        image_tags = img_xpath(tree)
+        
+        stylesheets, images, icons = await asyncio.gather(
+            asyncio.gather(*(safe_inline_stylesheet(urljoin(base_url, link.get('href'))) for link in stylesheet_links)),
+            # Inline images under 500KB and small favicons under 50KB
+            asyncio.gather(*(fetch_once(urljoin(base_url, img.get('src')), 500000) for img in image_tags)),
+            asyncio.gather(*(fetch_once(urljoin(base_url, link.get('href')), 50000) for link in icon_links))
+        )
+        
+        # Inline CSS files (external stylesheets)
+        for link, css_content in zip(stylesheet_links, stylesheets):
+            if css_content is not None:
+                # Create style tag and replace link
+                style_tag = lxml.html.Element('style')
+                style_tag.set('data-singlefile-css', link.get('href'))
+                style_tag.text = css_content
+                style_tag.tail = link.tail
+                link.getparent().replace(link, style_tag)
+                resources_inlined.append('css')
+        
+        # Inline images (img tags)
+        for img, img_fetched in zip(image_tags, images):
+            if img_fetched is None:
+                continue
+            img_data, content_type, _ = img_fetched
+            img_url = urljoin(base_url, img.get('src'))
+            if not content_type:
+                content_type, _ = mimetypes.guess_type(img_url)
+            if content_type and content_type.startswith('image/'):
+                img.set('src', data_uri(content_type, img_data))
+                resources_inlined.append('image')
+        
+        # Inline favicon
+        for link, icon_fetched in zip(icon_links, icons):
+            if icon_fetched is None:
+                continue
+            icon_data, content_type, _ = icon_fetched
+            content_type = content_type or 'image/x-icon'
+            link.set('href', data_uri(content_type, icon_data))
+            resources_inlined.append('favicon')
+        
+        # Remove external tracker scripts that might break offline viewing
+        for script in script_xpath(tree):
+            if TRACKER_SCRIPT_RE.search(script.get('src')):
+                script.drop_tree()
+        
+        # Add SingleFile signature comment
+        capture_time = datetime.now()
+        elapsed = (capture_time - start_time).total_seconds()
+        
+        signature = f"""
 <!--
  Page saved with SingleFile 
  url: {crawl_request.url} 
@@ -989,19 +1641,20 @@ async def singlefile_capture(crawl_request: CrawlRequest):
  resources inlined: {len(resources_inlined)} ({', '.join(set(resources_inlined))})
  capture time: {elapsed:.2f}s
 -->"""
-            
-            # Get the final HTML
-            final_html = signature + str(soup)
-            size_bytes = len(final_html.encode('utf-8'))
-            
-            return {
-                "success": True,
-                "html": final_html,
-                "size_bytes": size_bytes,
-                "resources_inlined": list(set(resources_inlined)),
-                "capture_time": f"{elapsed:.2f}s",
-                "resources_count": len(resources_inlined)
-            }
+        
+        # Serialize once to UTF-8 bytes; the size comes from the buffer itself
+        final_bytes = signature.encode('utf-8') + lxml.html.tostring(tree.getroottree(), encoding='utf-8', method='html')
+        size_bytes = len(final_bytes)
+        final_html = final_bytes.decode('utf-8')
+        
+        return {
+            "success": True,
+            "html": final_html,
+            "size_bytes": size_bytes,
+            "resources_inlined": list(set(resources_inlined)),
+            "capture_time": f"{elapsed:.2f}s",
+            "resources_count": len(resources_inlined)
+        }
             
     except Exception as e:
         logger.error(f"SingleFile capture failed: {e}")
@@ -1017,6 +1670,24 @@ async def singlefile_capture(crawl_request: CrawlRequest):
         }
 
 # PDF processing endpoints
+def extract_pdf_annotation_links(pdf_stream) -> tuple:
+    """Read link annotations from a PDF file object; returns (total_pages, links).
+    
+    Blocking and CPU-bound, so endpoints run it through asyncio.to_thread.
+    """
+    import pypdf
+    
+    pdf_stream.seek(0)
+    pdf_reader = pypdf.PdfReader(pdf_stream, strict=False)
+    
+    links = [
+        {"url": uri, "page": page_num + 1}
+        for page_num, page in enumerate(pdf_reader.pages)
+        for uri in iter_pdf_uri_links(page)
+    ]
+    
+    return len(pdf_reader.pages), links
+
 @app.post("/api/pdf/extract")
 async def extract_pdf_links(file: UploadFile):
     """Extract links from uploaded PDF file."""
@@ -1024,32 +1695,13 @@ async def extract_pdf_links(file: UploadFile):
         if not file.filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="File must be a PDF")
         
-        import pypdf
-        from io import BytesIO
-        
-        pdf_content = await file.read()
-        pdf_reader = pypdf.PdfReader(BytesIO(pdf_content))
-        
-        links = []
-        for page_num, page in enumerate(pdf_reader.pages):
-            if '/Annots' in page:
-                for annot in page['/Annots']:
-                    annot_obj = annot.get_object()
-                    if annot_obj.get('/Subtype') == '/Link':
-                        if '/A' in annot_obj:
-                            action = annot_obj['/A']
-                            if action.get('/S') == '/URI':
-                                uri = action.get('/URI')
-                                if uri:
-                                    links.append({
-                                        "url": str(uri),
-                                        "page": page_num + 1
-                                    })
+        # Read straight from the upload's spooled temp file instead of copying it into memory
+        total_pages, links = await asyncio.to_thread(extract_pdf_annotation_links, file.file)
         
         return {
             "success": True,
             "filename": file.filename,
-            "total_pages": len(pdf_reader.pages),
+            "total_pages": total_pages,
             "links_found": len(links),
             "links": links
         }
@@ -1082,7 +1734,6 @@ async def parse_local_pdf(
         # Save uploaded file temporarily
         import tempfile
         import shutil
-        from io import BytesIO
         
         pdf_content = await file.read()
         
@@ -1093,7 +1744,8 @@ async def parse_local_pdf(
             raise HTTPException(status_code=400, detail=pdf_data["error"])
         
         # Create output filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        parsed_at = datetime.now()
+        timestamp = parsed_at.strftime("%Y%m%d_%H%M%S")
         safe_filename = file.filename.replace('.pdf', '').replace(' ', '_').replace('/', '_')
         base_filename = f"pdf_parse_{safe_filename}_{timestamp}"
         
@@ -1104,7 +1756,7 @@ async def parse_local_pdf(
         results = {
             "success": True,
             "message": f"PDF parsing completed: {file.filename}",
-            "crawl_id": f"pdf_{hash(file.filename + timestamp) % 10000}",
+            "crawl_id": f"pdf_{hashlib.blake2b((file.filename + timestamp).encode(), digest_size=6).hexdigest()}",
             "source": f"Local PDF: {file.filename}",
             "meta": {
                 "total_pages": pdf_data["total_pages"],
@@ -1142,146 +1794,172 @@ async def parse_local_pdf(
                     "crawl_order": 1
                 }],
                 "combined_content": f"\n\n=== {pdf_data['title'] or file.filename} ===\n{pdf_data['content']}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": parsed_at.isoformat()
             }
         }
         
+        pdf_title = pdf_data['title'] or file.filename
+        pdf_links = pdf_data['links']
+        
         # Add markdown format
         if "md" in formats_list or "markdown" in formats_list:
+            md_links = '\n'.join([f"- [{link['url']}]({link['url']}) (Page {link['page']})" for link in pdf_links])
             results["markdown"] = f"""
-# {pdf_data['title'] or file.filename}
+# {pdf_title}
 **Source:** Local PDF File  
 **Pages:** {pdf_data['total_pages']}  
 **Words:** {pdf_data['word_count']}  
-**Links Found:** {len(pdf_data['links'])}
+**Links Found:** {len(pdf_links)}
 
 {pdf_data['content']}
 
 ## Links Found in PDF
-{chr(10).join(f"- [{link['url']}]({link['url']}) (Page {link['page']})" for link in pdf_data['links'])}
+{md_links}
 """
         
-        # Add HTML format
+        # Add HTML format; PDF text and link targets are untrusted, so everything is escaped
         if "html" in formats_list:
+            html_links = []
+            for link in pdf_links:
+                escaped_url = html.escape(link['url'])
+                html_links.append(f"<li><a href='{escaped_url}'>{escaped_url}</a> (Page {link['page']})</li>")
             results["html"] = f"""<html><head><title>PDF Parse Results</title></head><body>
 <div style='margin: 20px 0; border-bottom: 1px solid #ccc; padding-bottom: 20px;'>
-<h2>{pdf_data['title'] or file.filename}</h2>
+<h2>{html.escape(pdf_title)}</h2>
 <p><strong>Source:</strong> Local PDF File</p>
 <p><strong>Pages:</strong> {pdf_data['total_pages']}</p>
 <p><strong>Words:</strong> {pdf_data['word_count']}</p>
-<p><strong>Links Found:</strong> {len(pdf_data['links'])}</p>
-<div>{pdf_data['content'].replace(chr(10), '<br>')}</div>
+<p><strong>Links Found:</strong> {len(pdf_links)}</p>
+<div>{html.escape(pdf_data['content']).replace(chr(10), '<br>')}</div>
 <h3>Links Found</h3>
-<ul>{''.join(f"<li><a href='{link['url']}'>{link['url']}</a> (Page {link['page']})</li>" for link in pdf_data['links'])}</ul>
+<ul>{''.join(html_links)}</ul>
 </div></body></html>"""
         
         # Add text format
         if "txt" in formats_list or "text" in formats_list:
+            txt_links = '\n'.join([f"- {link['url']} (Page {link['page']})" for link in pdf_links])
             results["text"] = f"""
-=== {pdf_data['title'] or file.filename} ===
+=== {pdf_title} ===
 Source: Local PDF File
 Pages: {pdf_data['total_pages']}
 Words: {pdf_data['word_count']}
-Links Found: {len(pdf_data['links'])}
+Links Found: {len(pdf_links)}
 
 {pdf_data['content']}
 
 Links Found:
-{chr(10).join(f"- {link['url']} (Page {link['page']})" for link in pdf_data['links'])}
+{txt_links}
 """
         
         # Save files to crawl_output
-        output_dir = Path("./crawl_output")
-        output_dir.mkdir(exist_ok=True)
-        
+        output_dir = OUTPUT_DIR
         saved_files = []
         
-        # Save JSON
+        writes = []
+        
+        # Save JSON; when PDF links will be followed it is written once, after they are merged in
+        follow_pdf_links = follow_links and bool(pdf_data["links"])
         if "json" in formats_list:
             json_file = output_dir / f"{base_filename}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(results["json"], f, indent=2, ensure_ascii=False)
+            if not follow_pdf_links:
+                writes.append(asyncio.to_thread(write_json_file, json_file, results["json"]))
             saved_files.append(json_file.name)
         
         # Save Markdown
         if "md" in formats_list or "markdown" in formats_list:
             md_file = output_dir / f"{base_filename}.md"
-            with open(md_file, 'w', encoding='utf-8') as f:
-                f.write(results["markdown"])
+            writes.append(asyncio.to_thread(write_text_file, md_file, [results["markdown"]]))
             saved_files.append(md_file.name)
         
         # Save HTML
         if "html" in formats_list:
             html_file = output_dir / f"{base_filename}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(results["html"])
+            writes.append(asyncio.to_thread(write_text_file, html_file, [results["html"]]))
             saved_files.append(html_file.name)
         
         # Save Text
         if "txt" in formats_list or "text" in formats_list:
             txt_file = output_dir / f"{base_filename}.txt"
-            with open(txt_file, 'w', encoding='utf-8') as f:
-                f.write(results["text"])
+            writes.append(asyncio.to_thread(write_text_file, txt_file, [results["text"]]))
             saved_files.append(txt_file.name)
         
+        # Files are written concurrently in worker threads while any PDF links are crawled
+        pending_writes = asyncio.gather(*writes)
+        
         results["meta"]["files_saved"] = saved_files
         
         # If follow_links is enabled, crawl discovered links
-        if follow_links and pdf_data["links"]:
+        if follow_pdf_links:
             scraping_logger.info(f"Following {len(pdf_data['links'])} links from PDF...")
             
-            # Create crawl request for discovered links
-            additional_pages = []
-            crawled_count = 0
+            link_semaphore = asyncio.Semaphore(PDF_LINK_CONCURRENCY)
+            host_next_slot = {}
+            loop = asyncio.get_running_loop()
             
-            for link_info in pdf_data["links"][:max_pages_from_links]:
-                if crawled_count >= max_pages_from_links:
-                    break
-                    
-                try:
-                    # Create a basic crawl request for the link
-                    from urllib.parse import urlparse
-                    link_url = link_info["url"]
-                    
-                    # Skip non-HTTP URLs
-                    parsed = urlparse(link_url)
-                    if not parsed.scheme.startswith('http'):
-                        continue
+            def pdf_link_request(link_url: str) -> CrawlRequest:
+                """Create a simple crawl request for one link found in the PDF."""
+                return CrawlRequest(
+                    url=link_url,
+                    max_depth=0,  # Don't go deeper from PDF links
+                    max_pages=1,
+                    export_formats=["json"],
+                    auth_type="none",
+                    ignore_robots=True
+                )
+            
+            async def crawl_pdf_link(link_info: dict, session, crawler):
+                """Crawl one link found in the PDF, spacing requests to a host by the crawl delay."""
+                link_url = link_info["url"]
+                simple_request = pdf_link_request(link_url)
+                
+                host = urlparse(link_url).netloc.lower()
+                async with link_semaphore:
+                    now = loop.time()
+                    slot = max(now, host_next_slot.get(host, now))
+                    host_next_slot[host] = slot + request_delay(simple_request)
+                    if slot > now:
+                        await asyncio.sleep(slot - now)
                     
                     scraping_logger.info(f"Crawling link from PDF page {link_info['page']}: {link_url}")
-                    
-                    # Create a simple crawl request
-                    simple_request = CrawlRequest(
-                        url=link_url,
-                        max_depth=0,  # Don't go deeper from PDF links
-                        max_pages=1,
-                        export_formats=["json"],
-                        auth_type="none",
-                        ignore_robots=True
-                    )
-                    
-                    # Crawl the single page
-                    page_result = await crawl_single_page(link_url, simple_request)
-                    
-                    if page_result and page_result.get("success"):
-                        additional_pages.append({
-                            "success": True,
-                            "title": page_result.get("title", "Unknown"),
-                            "content": page_result.get("content", ""),
-                            "word_count": page_result.get("word_count", 0),
-                            "links": page_result.get("links", []),
-                            "images": page_result.get("images", []),
-                            "source_type": "web_from_pdf",
-                            "pdf_page": link_info["page"],
-                            "url": link_url,
-                            "depth": 1,
-                            "crawl_order": crawled_count + 2
-                        })
-                        crawled_count += 1
-                        
-                except Exception as e:
-                    scraping_logger.error(f"Failed to crawl PDF link {link_url}: {e}")
+                    return await crawl_single_page(link_url, simple_request, session, crawler, crawler is not None)
+            
+            # Skip non-HTTP URLs
+            http_links = [link_info for link_info in pdf_data["links"][:max_pages_from_links]
+                          if urlparse(link_info["url"]).scheme.startswith('http')]
+            
+            async with AsyncExitStack() as stack:
+                session = await stack.enter_async_context(create_crawl_http_session())
+                
+                # One browser shared by all link tasks; if it can't start, every link uses HTTP extraction
+                crawler = None
+                if http_links and browser_automation_enabled():
+                    try:
+                        crawler = await stack.enter_async_context(create_page_crawler(pdf_link_request(http_links[0]["url"])))
+                    except Exception as e:
+                        scraping_logger.warning(f"Browser automation unavailable for PDF links, using HTTP extraction: {e}")
+                
+                page_results = await asyncio.gather(*(crawl_pdf_link(link_info, session, crawler) for link_info in http_links),
+                                                    return_exceptions=True)
+            
+            additional_pages = []
+            for link_info, page_result in zip(http_links, page_results):
+                if isinstance(page_result, Exception):
+                    scraping_logger.error(f"Failed to crawl PDF link {link_info['url']}: {page_result}")
                     continue
+                if page_result and page_result.get("success"):
+                    additional_pages.append({
+                        "success": True,
+                        "title": page_result.get("title", "Unknown"),
+                        "content": page_result.get("content", ""),
+                        "word_count": page_result.get("word_count", 0),
+                        "links": page_result.get("links", []),
+                        "images": page_result.get("images", []),
+                        "source_type": "web_from_pdf",
+                        "pdf_page": link_info["page"],
+                        "url": link_info["url"],
+                        "depth": 1,
+                        "crawl_order": len(additional_pages) + 2
+                    })
             
             if additional_pages:
                 # Update results with additional pages
@@ -1297,23 +1975,24 @@ Links Found:
                 results["meta"]["max_depth_reached"] = 1
                 
                 # Update combined content
-                for page in additional_pages:
-                    results["json"]["combined_content"] += f"\n\n=== {page['title']} ({page['url']}) ===\n{page['content']}"
-                
-                # Re-save JSON with additional pages
-                if "json" in formats_list:
-                    json_file = output_dir / f"{base_filename}.json"
-                    with open(json_file, 'w', encoding='utf-8') as f:
-                        json.dump(results["json"], f, indent=2, ensure_ascii=False)
+                results["json"]["combined_content"] += ''.join(
+                    f"\n\n=== {page['title']} ({page['url']}) ===\n{page['content']}" for page in additional_pages
+                )
                 
                 scraping_logger.info(f"Successfully crawled {len(additional_pages)} additional pages from PDF links")
+            
+            # Serialize the JSON export once, with any additional pages included
+            if "json" in formats_list:
+                await asyncio.to_thread(write_json_file, json_file, results["json"])
+        
+        await pending_writes
         
         # Store last crawl results for download functionality
         global last_crawl_results
         last_crawl_results = results
         
         scraping_logger.info(f"PDF parsing completed successfully: {file.filename} - {pdf_data['word_count']} words, {len(pdf_data['links'])} links")
-        if follow_links and additional_pages:
+        if follow_pdf_links and additional_pages:
             scraping_logger.info(f"Successfully crawled {len(additional_pages)} web pages from PDF links")
         api_logger.info(f"PDF parsing completed: {file.filename} - Files saved: {saved_files}")
         
@@ -1324,78 +2003,137 @@ Links Found:
         scraping_logger.error(f"PDF parsing error for {file.filename}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"PDF parsing failed: {str(e)}")
 
+# Document info entries reported in PDF results: (result key, PDF info key)
+PDF_METADATA_FIELDS = (
+    ("author", "/Author"),
+    ("subject", "/Subject"),
+    ("creator", "/Creator"),
+    ("producer", "/Producer"),
+    ("creation_date", "/CreationDate"),
+    ("modification_date", "/ModDate"),
+)
+
+# Minimum pages per PDF text extraction task; each task re-opens the PDF in its worker
+PDF_MIN_PAGES_PER_TASK = 8
+
+def iter_pdf_uri_links(page) -> Iterator[str]:
+    """Yield the URI targets of a PDF page's link annotations, skipping malformed ones."""
+    # Each dictionary entry is looked up once and resolved explicitly; pages without annotations return at once
+    annots = page.get('/Annots')
+    if annots is None:
+        return
+    try:
+        annots = annots.get_object()
+    except Exception:
+        return
+    for annot in annots:
+        try:
+            annot_obj = annot.get_object()
+            if annot_obj.get('/Subtype') != '/Link':
+                continue
+            action = annot_obj.get('/A')
+            if action is None:
+                continue
+            action = action.get_object()
+            if action.get('/S') != '/URI':
+                continue
+            uri = action.get('/URI')
+            if uri is not None:
+                uri = str(uri.get_object())
+                if uri:
+                    yield uri
+        except Exception:
+            # Skip malformed annotations
+            continue
+
+# Failures that say nothing about the PDF itself, so re-reading it with pdfminer can't help.
+# A broken parse pool is not one of them: run_in_parse_pool has already replaced it, and
+# pdfminer runs in-process, so it can still extract the text.
+PDF_NON_DOCUMENT_ERRORS = (MemoryError,)
+
+def extract_pdf_text_raw(pdf_content: bytes) -> str:
+    """Extract raw PDF text with pdfminer, skipping its layout analysis."""
+    from pdfminer.high_level import extract_text_to_fp
+    
+    # extract_text() substitutes default LAParams for None; extract_text_to_fp() honours it
+    output = StringIO()
+    extract_text_to_fp(BytesIO(pdf_content), output, laparams=None)
+    return output.getvalue()
+
+def extract_pdf_pages(pdf_content: bytes, start: int, end: int) -> list:
+    """Extract (text, links) for pages start to end-1 of a PDF.
+
+    Runs in a worker process, so it must stay a module-level function.
+    """
+    import pypdf
+    
+    pdf_reader = pypdf.PdfReader(BytesIO(pdf_content))
+    pages = []
+    
+    for page_num in range(start, end):
+        page = pdf_reader.pages[page_num]
+        page_text = page.extract_text()
+        
+        # Extract links
+        links = [{"url": uri, "page": page_num + 1} for uri in iter_pdf_uri_links(page)]
+        
+        pages.append((page_text, links))
+    
+    return pages
+
 async def extract_pdf_content(pdf_content: bytes, filename: str) -> dict:
     """Extract text content, metadata, and links from PDF bytes."""
     try:
         import pypdf
-        from io import BytesIO
         
-        pdf_reader = pypdf.PdfReader(BytesIO(pdf_content))
+        pdf_reader = await asyncio.to_thread(pypdf.PdfReader, BytesIO(pdf_content))
+        total_pages = len(pdf_reader.pages)
         
-        # Extract text content from all pages
-        full_text = ""
-        links = []
+        # Text extraction is CPU-bound pure Python, so page ranges are spread across worker processes
+        pages_per_task = max(PDF_MIN_PAGES_PER_TASK, -(-total_pages // (os.cpu_count() or 1)))
+        page_ranges = await asyncio.gather(*(
+            run_in_parse_pool(extract_pdf_pages, pdf_content, start, min(start + pages_per_task, total_pages))
+            for start in range(0, total_pages, pages_per_task)
+        ))
         
-        for page_num, page in enumerate(pdf_reader.pages):
-            # Extract text
-            page_text = page.extract_text()
+        # Extract text content from all pages, in page order
+        text_parts = []
+        links = []
+        for page_num, (page_text, page_links) in enumerate(page for page_range in page_ranges for page in page_range):
             if page_text:
-                full_text += f"\n\nPage {page_num + 1}:\n{page_text.strip()}"
-            
-            # Extract links
-            if '/Annots' in page:
-                for annot in page['/Annots']:
-                    try:
-                        annot_obj = annot.get_object()
-                        if annot_obj.get('/Subtype') == '/Link':
-                            if '/A' in annot_obj:
-                                action = annot_obj['/A']
-                                if action.get('/S') == '/URI':
-                                    uri = action.get('/URI')
-                                    if uri:
-                                        links.append({
-                                            "url": str(uri),
-                                            "page": page_num + 1
-                                        })
-                    except Exception as e:
-                        # Skip malformed annotations
-                        continue
+                text_parts.append(f"Page {page_num + 1}:\n{page_text.strip()}")
+            links.extend(page_links)
+        full_text = "\n\n".join(text_parts)
+        # Parts are joined by whitespace, so their word counts add up to the document's
+        word_count = sum(len(part.split()) for part in text_parts)
         
-        # Extract metadata
+        # Extract metadata; each field is looked up once
         metadata = pdf_reader.metadata or {}
         title = metadata.get('/Title', filename)
         if title:
             title = str(title).strip()
-        
-        # Clean up text
-        full_text = full_text.strip()
-        word_count = len(full_text.split()) if full_text else 0
+        metadata_fields = {}
+        for name, key in PDF_METADATA_FIELDS:
+            value = metadata.get(key)
+            metadata_fields[name] = str(value) if value else ''
         
         return {
             "success": True,
             "content": full_text,
             "title": title,
-            "total_pages": len(pdf_reader.pages),
+            "total_pages": total_pages,
             "word_count": word_count,
             "links": links,
-            "metadata": {
-                "author": str(metadata.get('/Author', '')) if metadata.get('/Author') else '',
-                "subject": str(metadata.get('/Subject', '')) if metadata.get('/Subject') else '',
-                "creator": str(metadata.get('/Creator', '')) if metadata.get('/Creator') else '',
-                "producer": str(metadata.get('/Producer', '')) if metadata.get('/Producer') else '',
-                "creation_date": str(metadata.get('/CreationDate', '')) if metadata.get('/CreationDate') else '',
-                "modification_date": str(metadata.get('/ModDate', '')) if metadata.get('/ModDate') else ''
-            }
+            "metadata": metadata_fields
         }
         
     except Exception as e:
         # Fallback to pdfminer for problematic PDFs
         try:
-            from pdfminer.high_level import extract_text
-            from pdfminer.high_level import extract_pages
-            from pdfminer.layout import LTTextContainer
+            if isinstance(e, PDF_NON_DOCUMENT_ERRORS):
+                raise RuntimeError("pdfminer fallback skipped") from e
             
-            full_text = extract_text(BytesIO(pdf_content))
+            full_text = await asyncio.to_thread(extract_pdf_text_raw, pdf_content)
             word_count = len(full_text.split()) if full_text else 0
             
             return {
@@ -1421,15 +2159,23 @@ async def extract_pdf_content(pdf_content: bytes, filename: str) -> dict:
             }
 
 # SSO Authentication System
-import sqlite3
-import json as json_module
-from datetime import datetime, timedelta
-from urllib.parse import urlparse
+
+def connect_session_db() -> sqlite3.Connection:
+    """Open the session database with per-connection performance pragmas."""
+    # Pooled connections are used from asyncio.to_thread worker threads
+    conn = sqlite3.connect('sessions.db', check_same_thread=False)
+    conn.execute('PRAGMA synchronous=NORMAL')  # Safe with WAL; skips an fsync per commit
+    conn.execute('PRAGMA busy_timeout=5000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-20000')  # ~20MB page cache
+    return conn
 
 # Initialize session database
 def init_session_db():
     """Initialize SQLite database for session storage."""
-    conn = sqlite3.connect('sessions.db')
+    conn = connect_session_db()
+    # WAL lets status reads proceed while a session is being written (persists in the file)
+    conn.execute('PRAGMA journal_mode=WAL')
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS sessions (
@@ -1441,11 +2187,116 @@ def init_session_db():
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    # One session per domain, so saves can upsert; keep only the newest row of any older duplicates
+    cursor.execute('DELETE FROM sessions WHERE id NOT IN (SELECT MAX(id) FROM sessions GROUP BY domain)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_domain ON sessions(domain)')
+    # Active-session listing and the expiry reaper range-scan on expires_at alone
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)')
     conn.commit()
     conn.close()
 
-# Initialize session database on startup
-init_session_db()
+class SessionDBPool:
+    """Reusable session database connections, opened on first use.
+    
+    Each connection is used by one thread at a time; blocking SQLite calls
+    should run through asyncio.to_thread.
+    """
+    
+    def __init__(self, size: int = 8):
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def acquire(self):
+        """Check out a connection, rolling back any uncommitted work on error."""
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._opened < self.size:
+                    self._opened += 1
+                    conn = connect_session_db()
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+    
+    def close_all(self):
+        """Close the idle connections; later acquires open new ones."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+session_db_pool = SessionDBPool()
+
+# Session statements; each pooled connection prepares them once and reuses them from its statement cache
+# expires_at is computed by SQLite from a modifier such as '+24 hours', on the same UTC clock as the reads
+SQL_UPSERT_SESSION = """
+    INSERT INTO sessions (domain, session_data, expires_at) VALUES (?, ?, datetime('now', ?))
+    ON CONFLICT(domain) DO UPDATE SET
+        session_data = excluded.session_data,
+        expires_at = excluded.expires_at,
+        created_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+"""
+SQL_DELETE_BY_DOMAIN = 'DELETE FROM sessions WHERE domain = ?'
+SQL_DELETE_ALL = 'DELETE FROM sessions'
+SQL_DELETE_EXPIRED = "DELETE FROM sessions WHERE expires_at <= datetime('now')"
+SQL_SELECT_ACTIVE = """
+    SELECT domain, session_data, expires_at, created_at
+    FROM sessions
+    WHERE expires_at > datetime('now')
+    ORDER BY created_at DESC
+"""
+SQL_SELECT_BY_DOMAIN = """
+    SELECT session_data, expires_at FROM sessions
+    WHERE domain = ? AND expires_at > datetime('now')
+    ORDER BY created_at DESC LIMIT 1
+"""
+
+# Parsed session data per domain: domain -> (expires_at, session_data); cleared on save/logout
+_session_cache = {}
+# auth_status's active-session list as (monotonic time, sessions), reused briefly for polling UIs
+_auth_status_cache = None
+AUTH_STATUS_CACHE_TTL = 1.0
+
+def invalidate_session_cache(domains: Optional[List[str]] = None):
+    """Drop cached session data for the given domains, or for all domains."""
+    global _auth_status_cache
+    _auth_status_cache = None
+    if domains is None:
+        _session_cache.clear()
+    else:
+        for domain in domains:
+            _session_cache.pop(domain, None)
+
+def load_session_object(session_data: str) -> Optional[dict]:
+    """Parse a stored session_data column; None if it is not a JSON object."""
+    try:
+        session_obj = loads_json(session_data)
+    except ValueError:
+        return None
+    return session_obj if isinstance(session_obj, dict) else None
+
+def utc_now_sql(offset_hours: float = 0) -> str:
+    """Current UTC time, optionally offset, formatted like SQLite's datetime('now')."""
+    return (datetime.now(timezone.utc) + timedelta(hours=offset_hours)).strftime('%Y-%m-%d %H:%M:%S')
+
+# netloc of an http(s) URL, matching urlparse(url).netloc without building a SplitResult
+URL_NETLOC_RE = re.compile(r'^https?://([^/?#]*)', re.IGNORECASE)
 
 class SSORequest(BaseModel):
     domain: str = ""
@@ -1459,14 +2310,15 @@ async def sso_login(request: SSORequest):
         if not url:
             raise HTTPException(status_code=400, detail="URL or domain required for SSO login")
         
-        domain = urlparse(url).netloc or request.domain
+        domain_match = URL_NETLOC_RE.match(url)
+        domain = (domain_match.group(1) if domain_match else '') or request.domain
         
         # In a real implementation, this would redirect to the SSO provider
         # For now, we'll simulate the process
         auth_data = {
             "domain": domain,
             "auth_url": f"https://{domain}/auth/login",
-            "state": f"state_{hash(domain) % 10000}",
+            "state": f"state_{secrets.token_urlsafe(12)}",
             "redirect_uri": f"http://localhost:5000/api/auth/callback",
             "login_type": "sso"
         }
@@ -1485,35 +2337,34 @@ async def sso_login(request: SSORequest):
         api_logger.error(f"SSO login failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"SSO login failed: {str(e)}")
 
+def parse_session_request(request: dict) -> tuple:
+    """Validate a save-session payload; returns (domain, session_data, expires_hours)."""
+    domain = request.get("domain", "")
+    session_data = request.get("session_data", {})
+    expires_hours = float(request.get("expires_hours", 24))  # Default 24 hours
+    
+    if not domain or not session_data:
+        raise HTTPException(status_code=400, detail="Domain and session_data required")
+    
+    return domain, session_data, expires_hours
+
+def write_sessions(sessions: List[tuple]) -> None:
+    """Replace the stored session for each (domain, session_data, expires_hours) in one transaction."""
+    with session_db_pool.acquire() as conn:
+        # Insert new sessions, replacing any existing session for the domain in place
+        conn.executemany(SQL_UPSERT_SESSION, [(domain, dumps_compact(session_data), f"{expires_hours:+} hours") for domain, session_data, expires_hours in sessions])
+        conn.commit()
+    invalidate_session_cache([domain for domain, _, _ in sessions])
+
 @app.post("/api/auth/save-session")
 async def save_auth_session(request: dict):
     """Save authentication session data."""
     try:
-        domain = request.get("domain", "")
-        session_data = request.get("session_data", {})
-        expires_hours = request.get("expires_hours", 24)  # Default 24 hours
-        
-        if not domain or not session_data:
-            raise HTTPException(status_code=400, detail="Domain and session_data required")
-        
-        # Calculate expiration
-        expires_at = datetime.now() + timedelta(hours=expires_hours)
+        domain, session_data, expires_hours = parse_session_request(request)
         
         # Save to database
-        conn = sqlite3.connect('sessions.db')
-        cursor = conn.cursor()
-        
-        # Remove existing sessions for this domain
-        cursor.execute('DELETE FROM sessions WHERE domain = ?', (domain,))
-        
-        # Insert new session
-        cursor.execute('''
-            INSERT INTO sessions (domain, session_data, expires_at) 
-            VALUES (?, ?, ?)
-        ''', (domain, json_module.dumps(session_data), expires_at))
-        
-        conn.commit()
-        conn.close()
+        await asyncio.to_thread(write_sessions, [(domain, session_data, expires_hours)])
+        expires_at = utc_now_sql(expires_hours)
         
         api_logger.info(f"Session saved for domain: {domain}, expires: {expires_at}")
         
@@ -1521,56 +2372,74 @@ async def save_auth_session(request: dict):
             "success": True,
             "message": f"Session saved for {domain}",
             "domain": domain,
-            "expires": expires_at.isoformat(),
-            "session_id": f"session_{hash(domain) % 10000}"
+            "expires": expires_at,
+            "session_id": f"session_{secrets.token_urlsafe(16)}"
         }
         
     except Exception as e:
         api_logger.error(f"Save session failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to save session: {str(e)}")
 
+@app.post("/api/auth/save-sessions")
+async def save_auth_sessions(requests: List[dict]):
+    """Save authentication session data for several domains in one transaction."""
+    try:
+        sessions = [parse_session_request(request) for request in requests]
+        
+        # Save to database
+        await asyncio.to_thread(write_sessions, sessions)
+        
+        api_logger.info(f"Sessions saved for {len(sessions)} domains: {', '.join(domain for domain, _, _ in sessions)}")
+        
+        return {
+            "success": True,
+            "message": f"Sessions saved for {len(sessions)} domains",
+            "sessions": [
+                {
+                    "domain": domain,
+                    "expires": utc_now_sql(expires_hours),
+                    "session_id": f"session_{secrets.token_urlsafe(16)}"
+                }
+                for domain, _, expires_hours in sessions
+            ]
+        }
+        
+    except Exception as e:
+        api_logger.error(f"Save sessions failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to save sessions: {str(e)}")
+
 @app.get("/api/auth/status")
 async def auth_status():
     """Get current authentication status."""
     try:
-        conn = sqlite3.connect('sessions.db')
-        cursor = conn.cursor()
-        
-        # Get active sessions (not expired)
-        cursor.execute('''
-            SELECT domain, session_data, expires_at, created_at 
-            FROM sessions 
-            WHERE expires_at > datetime('now') 
-            ORDER BY created_at DESC
-        ''')
-        
-        active_sessions = []
-        for row in cursor.fetchall():
-            domain, session_data, expires_at, created_at = row
-            try:
-                session_obj = json_module.loads(session_data)
-                active_sessions.append({
+        # Expired sessions are removed by reap_expired_sessions, so this is read-only
+        def read_active_sessions():
+            with session_db_pool.acquire() as conn:
+                # Get active sessions (not expired)
+                return conn.execute(SQL_SELECT_ACTIVE).fetchall()
+        
+        global _auth_status_cache
+        loop = asyncio.get_running_loop()
+        if _auth_status_cache is not None and loop.time() - _auth_status_cache[0] < AUTH_STATUS_CACHE_TTL:
+            active_sessions = _auth_status_cache[1]
+        else:
+            rows = await asyncio.to_thread(read_active_sessions)
+            
+            # Rows with malformed session data are skipped
+            active_sessions = [
+                {
                     "domain": domain,
                     "expires_at": expires_at,
                     "created_at": created_at,
                     "session_type": session_obj.get("type", "unknown"),
                     "user": session_obj.get("user", "anonymous")
-                })
-            except:
-                continue
-        
-        conn.close()
-        
-        # Clean up expired sessions
-        conn = sqlite3.connect('sessions.db')
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM sessions WHERE expires_at <= datetime("now")')
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
-        if deleted_count > 0:
-            api_logger.info(f"Cleaned up {deleted_count} expired sessions")
+                }
+                for domain, session_data, expires_at, created_at in rows
+                for session_obj in (load_session_object(session_data),)
+                if session_obj is not None
+            ]
+            
+            _auth_status_cache = (loop.time(), active_sessions)
         
         return {
             "authenticated": len(active_sessions) > 0,
@@ -1591,6 +2460,35 @@ async def auth_status():
             "message": "Failed to check authentication status"
         }
 
+def delete_expired_sessions() -> int:
+    """Delete expired sessions; returns the row count."""
+    with session_db_pool.acquire() as conn:
+        cursor = conn.execute(SQL_DELETE_EXPIRED)
+        conn.commit()
+        return cursor.rowcount
+
+async def reap_expired_sessions(interval_seconds: float = 60.0):
+    """Periodically clean up expired sessions in the background."""
+    while True:
+        try:
+            deleted_count = await asyncio.to_thread(delete_expired_sessions)
+            if deleted_count > 0:
+                api_logger.info(f"Cleaned up {deleted_count} expired sessions")
+        except Exception as e:
+            api_logger.error(f"Expired session cleanup failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
+
+def delete_sessions(domain: Optional[str] = None) -> int:
+    """Delete the sessions for one domain, or all sessions; returns the row count."""
+    with session_db_pool.acquire() as conn:
+        if domain is None:
+            cursor = conn.execute(SQL_DELETE_ALL)
+        else:
+            cursor = conn.execute(SQL_DELETE_BY_DOMAIN, (domain,))
+        conn.commit()
+    invalidate_session_cache(None if domain is None else [domain])
+    return cursor.rowcount
+
 @app.post("/api/auth/logout")
 async def logout(request: dict):
     """Logout and remove session for a domain."""
@@ -1598,12 +2496,7 @@ async def logout(request: dict):
         domain = request.get("domain")
         if not domain:
             # Logout from all domains
-            conn = sqlite3.connect('sessions.db')
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM sessions')
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+            deleted_count = await asyncio.to_thread(delete_sessions)
             
             api_logger.info(f"Logged out from all domains ({deleted_count} sessions removed)")
             return {
@@ -1612,12 +2505,7 @@ async def logout(request: dict):
             }
         else:
             # Logout from specific domain
-            conn = sqlite3.connect('sessions.db')
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM sessions WHERE domain = ?', (domain,))
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+            deleted_count = await asyncio.to_thread(delete_sessions, domain)
             
             if deleted_count > 0:
                 api_logger.info(f"Logged out from {domain}")
@@ -1636,21 +2524,24 @@ async def logout(request: dict):
         raise HTTPException(status_code=500, detail=f"Logout failed: {str(e)}")
 
 def get_session_for_domain(domain: str) -> dict:
-    """Get active session data for a domain."""
+    """Get active session data for a domain.
+    
+    Parsed rows are cached per domain until they expire or the domain's
+    session is saved or logged out.
+    """
     try:
-        conn = sqlite3.connect('sessions.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT session_data FROM sessions 
-            WHERE domain = ? AND expires_at > datetime('now')
-            ORDER BY created_at DESC LIMIT 1
-        ''', (domain,))
+        # Same comparison as the SQL filter below, without touching the database
+        cached = _session_cache.get(domain)
+        if cached is not None and cached[0] > utc_now_sql():
+            return dict(cached[1])
         
-        row = cursor.fetchone()
-        conn.close()
+        with session_db_pool.acquire() as conn:
+            row = conn.execute(SQL_SELECT_BY_DOMAIN, (domain,)).fetchone()
         
         if row:
-            return json_module.loads(row[0])
+            session_data = loads_json(row[0])
+            _session_cache[domain] = (row[1], session_data)
+            return dict(session_data)
         return {}
     except:
         return {}
@@ -1775,21 +2666,52 @@ def generate_urls_csv(crawl_data: dict, source_name: str = "crawl") -> str:
     output.close()
     return csv_content
 
+@lru_cache(maxsize=None)
+def load_frontend_asset(path: str) -> tuple:
+    """Read a frontend asset once; returns (content, gzipped content, digest for ETags).
+    
+    The gzip copy is compressed once at maximum level, so GZipMiddleware
+    doesn't recompress the asset on every request.
+    """
+    content = Path(path).read_bytes()
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return content, gzip.compress(content, compresslevel=9, mtime=0), digest
+
+def frontend_asset_response(request: Request, path: str, media_type: str) -> Response:
+    """Serve a cached frontend asset, answering 304 when the client copy is current."""
+    content, gzipped, digest = load_frontend_asset(path)
+    # Same check GZipMiddleware uses; each encoding gets its own ETag
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    etag = f'"{digest}-gzip"' if use_gzip else f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600, must-revalidate", "Vary": "Accept-Encoding"}
+    # If-None-Match may list several tags or use weak validators; either encoding's tag means the content is current
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if not client_etags.isdisjoint((f'"{digest}"', f'"{digest}-gzip"', "*")):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gzipped, media_type=media_type, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
 # Serve the main HTML file
 @app.get("/")
-async def serve_frontend():
+async def serve_frontend(request: Request):
     """Serve the main frontend HTML file."""
-    return FileResponse("index.html")
+    return frontend_asset_response(request, "index.html", "text/html")
 
 # Serve session frontend JavaScript
 @app.get("/session_frontend.js")
-async def serve_session_frontend():
+async def serve_session_frontend(request: Request):
     """Serve the session frontend JavaScript file."""
-    return FileResponse("session_frontend.js", media_type="application/javascript")
+    return frontend_asset_response(request, "session_frontend.js", "application/javascript")
 
 # Run the server
 if __name__ == "__main__":
+    import multiprocessing
     import uvicorn
+    # Required for the parse worker processes in frozen Windows builds
+    multiprocessing.freeze_support()
     logger.info("Starting unified CrawlOps server...")
     uvicorn.run(
         app,